@@ -0,0 +1,320 @@
+#!/usr/bin/env python3
+"""
+benchmarks.py
+
+Micro-benchmarks for the pipeline's hot loops. Nothing here touches a database
+or the network; inputs are synthetic files in a temporary directory.
+
+Usage:
+    # Row parser: compiled RowParser vs the previous dict-per-row parser
+    python benchmarks.py row_parser --rows 1000000
+
+    # Extraction: MB/s and peak RSS per archive, whole-member reads vs
+    # streaming (synthetic archive, or real ones with --zip)
+    python benchmarks.py extract --mb 512
+    python benchmarks.py extract --zip downloads/2025/Real_jur_exempt.zip
+
+    # Zip-Slip checks: per-member resolve()/mkdir vs the normalized checks
+    python benchmarks.py zip_slip --members 50000
+"""
+
+from __future__ import annotations
+
+import argparse
+import multiprocessing
+import os
+import random
+import shutil
+import tempfile
+import time
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List
+
+from sqlalchemy import MetaData
+
+import extract
+import load
+import schema_config
+
+try:
+    import resource
+except ImportError:  # Windows: peak RSS is not reported
+    resource = None
+
+
+def _synthetic_real_acct(path: Path, columns: List[str], rows: int) -> None:
+    """Write a tab-delimited real_acct-shaped file: unique acct keys, a mix of
+    blank, padded and numeric values."""
+    rng = random.Random(42)
+    numeric = set(schema_config.get_column_types("real_acct"))
+    words = ["MAIN", "OAK", "  ELM ", "HOUSTON", "TX", "", "", "A1"]
+    with path.open("w", encoding="utf-8", newline="\n") as fh:
+        fh.write("\t".join(columns) + "\n")
+        for n in range(rows):
+            values = []
+            for col in columns:
+                if col == "acct":
+                    values.append(f"{n:013d}")
+                elif col in numeric:
+                    values.append(str(rng.randint(0, 900000)))
+                else:
+                    values.append(rng.choice(words))
+            fh.write("\t".join(values) + "\n")
+
+
+def _dict_rows(
+    table, lines: Iterable[str], header: List[str], expected_cols: List[str]
+) -> Iterator[Dict[str, str | None]]:
+    """The row parser as it was before RowParser: one dict per row, list
+    membership per field and a schema_config lookup per line."""
+    for line in lines:
+        line = line.rstrip("\r\n")
+        if not line:
+            continue
+        parts = line.split("\t")
+        row_map: Dict[str, str | None] = {col: None for col in expected_cols}
+        for col_name, value in zip(header, parts):
+            if col_name in expected_cols:
+                value = value.strip()
+                if value is not None:
+                    value = value.replace("\x00", "")
+                if value == "":
+                    value = None
+                row_map[col_name] = value
+        pk_cols = schema_config.get_primary_key(table.name)
+        if pk_cols and any(row_map.get(pk_col) is None for pk_col in pk_cols):
+            continue
+        if row_map:
+            yield row_map
+
+
+def _dict_convert(batch, converters, rejects) -> None:
+    for col, convert in converters:
+        converted = convert([row[col] for row in batch])
+        for row, value in zip(batch, converted):
+            if value is load._REJECT:
+                rejects.add([row.get(c) for c in rejects.pk_cols], col, row[col])
+                value = None
+            row[col] = value
+
+
+def bench_row_parser(rows: int, batch_size: int) -> None:
+    codebook = load.discover_codebook_tables(load.CODEBOOK_DIR_DEFAULT)
+    table = load.build_table(MetaData(), "real_acct", codebook["real_acct"])
+    columns = [c.name for c in codebook["real_acct"]]
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "real_acct.txt"
+        _synthetic_real_acct(path, columns, rows)
+        with path.open("r", encoding="utf-8") as fh:
+            header_line = fh.readline()
+            lines = fh.readlines()
+    header, expected_cols = load._parse_header(table, header_line)
+    batches = [lines[i : i + batch_size] for i in range(0, len(lines), batch_size)]
+    rejects = load.RejectLog(None, "real_acct")
+
+    start = time.perf_counter()
+    converters = load._column_converters(table, expected_cols)
+    parsed = 0
+    for batch in batches:
+        row_maps = list(_dict_rows(table, batch, header, expected_cols))
+        _dict_convert(row_maps, converters, rejects)
+        parsed += len(row_maps)
+    dict_secs = time.perf_counter() - start
+
+    start = time.perf_counter()
+    parser = load.RowParser(table, header, expected_cols, rejects)
+    compiled = sum(len(parser.parse(batch)) for batch in batches)
+    compiled_secs = time.perf_counter() - start
+
+    assert parsed == compiled == rows, (parsed, compiled, rows)
+    print(f"row_parser: {rows:,} real_acct lines, {len(expected_cols)} columns")
+    print(f"  dict rows   {dict_secs:7.2f}s  {rows / dict_secs:>12,.0f} rows/s")
+    print(
+        f"  RowParser   {compiled_secs:7.2f}s  {rows / compiled_secs:>12,.0f} rows/s"
+        f"  ({dict_secs / compiled_secs:.1f}x)"
+    )
+
+
+def _peak_rss_mb() -> float | None:
+    if resource is None:
+        return None
+    # ru_maxrss is KiB on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def _read_all_extract(zipf: zipfile.ZipFile, target_dir: Path) -> None:
+    """Extraction as it was before streaming: each member read whole."""
+    target_dir.mkdir(parents=True, exist_ok=True)
+    for member in zipf.namelist():
+        if member.endswith("/"):
+            continue
+        out = target_dir / member
+        out.parent.mkdir(parents=True, exist_ok=True)
+        with zipf.open(member) as src, open(out, "wb") as dst:
+            dst.write(src.read())
+
+
+def _extract_run(zip_path: str, dest: str, mode: str, buffer_size: int):
+    """Runs in a fresh process so the peak RSS belongs to this archive alone."""
+    before = _peak_rss_mb()
+    start = time.perf_counter()
+    with zipfile.ZipFile(zip_path) as zf:
+        if mode == "read-all":
+            _read_all_extract(zf, Path(dest))
+        else:
+            extract.safe_extract(zf, Path(dest), buffer_size)
+    secs = time.perf_counter() - start
+    return secs, before, _peak_rss_mb()
+
+
+def _synthetic_archive(path: Path, mb: int) -> None:
+    """A zip with one jur_value-like text member of about mb MiB."""
+    rng = random.Random(42)
+    block = "".join(
+        f"{rng.randrange(10**12):013d}\t{rng.randrange(10**6)}\t{rng.randrange(10**6)}\n"
+        for _ in range(20_000)
+    ).encode()
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED, compresslevel=1) as zf:
+        with zf.open("jur_value.txt", "w", force_zip64=True) as fh:
+            written = 0
+            while written < mb * 1024 * 1024:
+                fh.write(block)
+                written += len(block)
+
+
+def bench_extract(zips: List[str], mb: int, buffer_size: int) -> None:
+    spawn = multiprocessing.get_context("spawn")
+    with tempfile.TemporaryDirectory() as tmp:
+        if not zips:
+            synthetic = Path(tmp) / "synthetic.zip"
+            _synthetic_archive(synthetic, mb)
+            zips = [str(synthetic)]
+        for zip_path in zips:
+            with zipfile.ZipFile(zip_path) as zf:
+                size_mb = sum(i.file_size for i in zf.infolist()) / (1024 * 1024)
+            print(f"extract: {Path(zip_path).name}, {size_mb:,.0f} MiB uncompressed")
+            for mode in ("read-all", "streaming"):
+                dest = Path(tmp) / "out"
+                with ProcessPoolExecutor(max_workers=1, mp_context=spawn) as ex:
+                    secs, before, peak = ex.submit(
+                        _extract_run, zip_path, str(dest), mode, buffer_size
+                    ).result()
+                shutil.rmtree(dest, ignore_errors=True)
+                rss = (
+                    f"peak RSS {peak:8,.0f} MiB (+{peak - before:,.0f})"
+                    if peak is not None
+                    else "peak RSS n/a"
+                )
+                print(f"  {mode:<10} {secs:7.2f}s  {size_mb / secs:8,.1f} MB/s  {rss}")
+
+
+def _resolve_extract(
+    zipf: zipfile.ZipFile, target_dir: Path, write: bool = True
+) -> None:
+    """safe_extract's member loop as it was before: resolve() of the root and
+    the member, and a mkdir(parents=True), for every member."""
+    target_dir.mkdir(parents=True, exist_ok=True)
+    for member in zipf.namelist():
+        abs_target = target_dir.joinpath(member).resolve()
+        if not str(abs_target).startswith(str(target_dir.resolve())):
+            continue
+        abs_target.parent.mkdir(parents=True, exist_ok=True)
+        if member.endswith("/") or not write:
+            continue
+        with zipf.open(member) as src, open(abs_target, "wb") as dst:
+            shutil.copyfileobj(src, dst)
+
+
+def _normalized_checks(zipf: zipfile.ZipFile, target_dir: Path) -> None:
+    """Only the path checks and directory creation of safe_extract."""
+    target_dir.mkdir(parents=True, exist_ok=True)
+    root = str(target_dir.resolve())
+    made_dirs = {root}
+    for member in zipf.namelist():
+        abs_target = extract._member_target(root, member)
+        if abs_target is None:
+            continue
+        parent = os.path.dirname(abs_target)
+        if parent not in made_dirs:
+            os.makedirs(parent, exist_ok=True)
+            made_dirs.add(parent)
+
+
+def bench_zip_slip(members: int, repeat: int = 3) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        archive = Path(tmp) / "many.zip"
+        # GIS-bundle shape: many small members spread over nested folders
+        with zipfile.ZipFile(archive, "w", zipfile.ZIP_STORED) as zf:
+            for n in range(members):
+                zf.writestr(f"layer_{n // 500:03d}/part_{n % 50:02d}/f{n}.dbf", b"x")
+        print(f"zip_slip: {members:,} members, best of {repeat}")
+        runs = {
+            "checks only": {
+                "resolve": lambda zf, dest: _resolve_extract(zf, dest, write=False),
+                "normalized": _normalized_checks,
+            },
+            "full extract": {
+                "resolve": _resolve_extract,
+                "normalized": extract.safe_extract,
+            },
+        }
+        for phase, impls in runs.items():
+            best = {label: float("inf") for label in impls}
+            # Alternate implementations so filesystem state favours neither
+            for _ in range(repeat):
+                for label, run in impls.items():
+                    dest = Path(tmp) / label
+                    with zipfile.ZipFile(archive) as zf:
+                        start = time.perf_counter()
+                        run(zf, dest)
+                        best[label] = min(best[label], time.perf_counter() - start)
+                    shutil.rmtree(dest)
+            print(f"  {phase}")
+            for label, secs in best.items():
+                print(
+                    f"    {label:<10} {secs:7.2f}s  {members / secs:>10,.0f} members/s"
+                    f"  ({best['resolve'] / secs:.1f}x)"
+                )
+
+
+def main() -> None:
+    p = argparse.ArgumentParser(description="Pipeline micro-benchmarks")
+    p.add_argument("benchmark", choices=["row_parser", "extract", "zip_slip"])
+    p.add_argument("--rows", type=int, default=1_000_000, help="Synthetic data rows")
+    p.add_argument(
+        "--batch-size",
+        type=int,
+        default=load.COPY_BATCH_ROWS,
+        help="Lines parsed per batch (default: the COPY batch size)",
+    )
+    p.add_argument(
+        "--zip",
+        action="append",
+        default=[],
+        help="extract: archive to benchmark (repeatable; default: a synthetic one)",
+    )
+    p.add_argument(
+        "--mb", type=int, default=256, help="extract: synthetic member size in MiB"
+    )
+    p.add_argument(
+        "--members", type=int, default=50_000, help="zip_slip: synthetic members"
+    )
+    p.add_argument(
+        "--buffer-kb",
+        type=int,
+        default=extract.EXTRACT_BUFFER_SIZE // 1024,
+        help="extract: streaming buffer size in KiB",
+    )
+    args = p.parse_args()
+    if args.benchmark == "row_parser":
+        bench_row_parser(args.rows, args.batch_size)
+    elif args.benchmark == "extract":
+        bench_extract(args.zip, args.mb, args.buffer_kb * 1024)
+    elif args.benchmark == "zip_slip":
+        bench_zip_slip(args.members)
+
+
+if __name__ == "__main__":
+    main()
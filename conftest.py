@@ -0,0 +1,34 @@
+"""
+Shared pytest fixtures.
+"""
+
+import os
+import uuid
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.exc import SQLAlchemyError
+
+
+@pytest.fixture
+def pg_uri():
+    """URI of a throwaway database created on the PostgreSQL server DATABASE_URL
+    points at; tests using it are skipped without one."""
+    base = os.getenv("DATABASE_URL")
+    if not base or not base.startswith("postgresql"):
+        pytest.skip("DATABASE_URL does not point at PostgreSQL")
+    name = f"hcad_test_{uuid.uuid4().hex[:12]}"
+    admin = create_engine(base, future=True, isolation_level="AUTOCOMMIT")
+    try:
+        with admin.connect() as conn:
+            conn.exec_driver_sql(f"CREATE DATABASE {name}")
+    except SQLAlchemyError as e:
+        admin.dispose()
+        pytest.skip(f"cannot create a test database: {e}")
+    try:
+        yield make_url(base).set(database=name).render_as_string(hide_password=False)
+    finally:
+        with admin.connect() as conn:
+            conn.exec_driver_sql(f"DROP DATABASE IF EXISTS {name} WITH (FORCE)")
+        admin.dispose()
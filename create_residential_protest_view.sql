@@ -3,6 +3,7 @@
 -- Includes all information needed for protesting assessed values
 -- Covers all residential state classes: A1-A4 (single-family, mobile, aux, duplex), B1-B4 (multi-family)
 -- Includes properties with multiple buildings
+-- Requires safe_num()/safe_date() from post_load_setup.sql
 -- =============================================
 
 CREATE OR REPLACE VIEW residential_protest_analysis AS
@@ -74,12 +75,10 @@ recent_sales AS (
     SELECT 
         d.acct,
         COUNT(*) AS sale_count,
-        MAX(to_date(NULLIF(d.dos, ''), 'MM/DD/YYYY')) AS last_sale_date,
+        MAX(safe_date(d.dos)) AS last_sale_date,
         NULL::numeric AS last_sale_price  -- deeds table doesn't have sale_price column
     FROM deeds d
-    WHERE d.dos IS NOT NULL 
-        AND d.dos <> ''
-        AND to_date(NULLIF(d.dos, ''), 'MM/DD/YYYY') >= CURRENT_DATE - INTERVAL '5 years'
+    WHERE safe_date(d.dos) >= CURRENT_DATE - INTERVAL '5 years'
     GROUP BY d.acct
 ),
 -- Exemptions summary
@@ -93,7 +92,7 @@ exemption_summary AS (
         BOOL_OR(je.exempt_cat LIKE 'OA%') AS has_over_65,
         BOOL_OR(je.exempt_cat LIKE 'DV%') AS has_disabled_veteran
     FROM jur_exempt je
-    WHERE je.exempt_val IS NOT NULL AND je.exempt_val <> ''
+    WHERE je.exempt_val IS NOT NULL
     GROUP BY je.acct
 )
 
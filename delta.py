@@ -0,0 +1,448 @@
+"""Incremental (delta) loading of HCAD extracted files into an existing database.
+
+HCAD republishes whole files, but most rows do not change between drops. A
+delta load stages each data file, hashes every row (MD5 of its cleaned
+values) keyed by the table's `schema_config` primary key and compares the
+hashes with the digests stored by the previous load in `hcad_meta.hcad_row_digest`.
+Only the differences are applied to the live tables:
+
+ - deletes: rows whose PK is no longer in the file, or whose FK parent is being
+   deleted (children first, so FKs hold);
+ - updates: rows whose digest changed (or, on the first delta run when no
+   digests exist yet, whose column values differ);
+ - inserts: new PKs whose FK parents exist.
+
+Tables without a primary key are replaced wholesale. A per-table summary of
+inserted/updated/deleted/unchanged counts is written as JSON.
+
+CLI Usage Example:
+        python load.py --delta --indir extracted --db-uri postgresql://...
+
+PostgreSQL only.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import io
+import json
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List
+
+from sqlalchemy import MetaData, Table
+
+import load
+import schema_config
+
+DIGEST_TABLE = load.DIGEST_TABLE
+STAGE_PREFIX = "_delta_stage_"
+# Separates PK values inside the digest key; never occurs in cleaned data
+_KEY_SEP = "\x1f"
+
+
+def _log(msg: str) -> None:
+    print(f"[delta] {msg}")
+
+
+def _stage_name(table_name: str) -> str:
+    return f"{STAGE_PREFIX}{table_name}"
+
+
+def _ensure_digest_table(engine) -> None:
+    with engine.begin() as conn:
+        conn.exec_driver_sql(f"CREATE SCHEMA IF NOT EXISTS {load.BOOKKEEPING_SCHEMA}")
+        conn.exec_driver_sql(
+            f"CREATE TABLE IF NOT EXISTS {DIGEST_TABLE} ("
+            "table_name TEXT NOT NULL, pk_key TEXT NOT NULL, digest TEXT NOT NULL, "
+            "PRIMARY KEY (table_name, pk_key))"
+        )
+
+
+def stage_table(
+    engine,
+    table: Table,
+    file_path: load.DataSource,
+    rejects_dir: str | Path | None = None,
+) -> List[str]:
+    """COPY a data file into an UNLOGGED all-TEXT stage table with `_pk_key`
+    and `_digest` columns, keeping the first row per PK.
+
+    Typed columns are converted as in a full load before hashing, so a
+    digest only changes when the stored values would.
+    Returns the data columns present in the file.
+    """
+    quote = engine.dialect.identifier_preparer.quote
+    stage = quote(_stage_name(table.name))
+    pk_cols = schema_config.get_primary_key(table.name)
+    with (
+        load.RejectLog(rejects_dir, table.name) as rejects,
+        load._open_data_file(file_path) as (header_line, lines),
+    ):
+        header, expected_cols = load._parse_header(table, header_line)
+        if not expected_cols:
+            return []
+        parser = load.RowParser(table, header, expected_cols, rejects)
+        raw = engine.raw_connection()
+        try:
+            cur = raw.cursor()
+            cur.execute(f"DROP TABLE IF EXISTS {stage}")
+            cur.execute(
+                f"CREATE UNLOGGED TABLE {stage} ("
+                + ", ".join(f"{quote(c)} TEXT" for c in expected_cols)
+                + ", _pk_key TEXT, _digest TEXT)"
+            )
+            copy_sql = (
+                f"COPY {stage} ("
+                + ", ".join(quote(c) for c in expected_cols)
+                + ", _pk_key, _digest) FROM STDIN"
+            )
+            for line_batch, _offset in load._line_batches(lines, load.COPY_BATCH_ROWS):
+                buf = io.StringIO()
+                for row in parser.parse(line_batch):
+                    line = load._copy_line(row)
+                    digest = hashlib.md5(line.encode("utf-8")).hexdigest()
+                    pk_key = _KEY_SEP.join(row[i] or "" for i in parser.pk_positions)
+                    buf.write(
+                        f"{line[:-1]}\t{pk_key.translate(load._COPY_ESCAPES)}\t{digest}\n"
+                    )
+                buf.seek(0)
+                cur.copy_expert(copy_sql, buf)
+            if pk_cols:
+                # Same rule as ON CONFLICT DO NOTHING: the first row per PK wins
+                cur.execute(
+                    f"DELETE FROM {stage} WHERE ctid IN (SELECT ctid FROM "
+                    f"(SELECT ctid, row_number() OVER (PARTITION BY _pk_key "
+                    f"ORDER BY ctid) AS rn FROM {stage}) d WHERE d.rn > 1)"
+                )
+                cur.execute(f"CREATE UNIQUE INDEX ON {stage} (_pk_key)")
+            cur.execute(f"ANALYZE {stage}")
+            raw.commit()
+        finally:
+            raw.close()
+    return expected_cols
+
+
+def _drop_stages(engine, table_names: List[str]) -> None:
+    quote = engine.dialect.identifier_preparer.quote
+    with engine.begin() as conn:
+        for name in table_names:
+            conn.exec_driver_sql(f"DROP TABLE IF EXISTS {quote(_stage_name(name))}")
+
+
+def _stage_worker(
+    db_uri: str,
+    codebook_dir: str,
+    table_name: str,
+    file_path: load.DataSource,
+    rejects_dir: str | None = None,
+) -> tuple[str, List[str]]:
+    """Process-pool entry point for `stage_table`."""
+    engine = load._create_engine(db_uri)
+    try:
+        table_defs = load.discover_codebook_tables(Path(codebook_dir))
+        table = load.build_table(MetaData(), table_name, table_defs[table_name])
+        return table_name, stage_table(engine, table, file_path, rejects_dir)
+    finally:
+        engine.dispose()
+
+
+def _staged_parents(table_name: str, staged: Dict[str, List[str]]):
+    """schema_config FKs of table_name whose parent file is part of this run."""
+    for local_cols, ref_table, ref_cols in schema_config.get_foreign_keys(table_name):
+        if ref_table == table_name or ref_table not in staged:
+            continue
+        if all(c in staged[table_name] for c in local_cols):
+            yield local_cols, ref_table, ref_cols
+
+
+def _parent_match_sql(quote, local_cols, ref_cols, alias: str, parent: str) -> str:
+    """`alias` row has NULL FK columns (MATCH SIMPLE) or a row in parent."""
+    join = " AND ".join(
+        f"p.{quote(r)} = {alias}.{quote(c)}" for c, r in zip(local_cols, ref_cols)
+    )
+    nulls = " OR ".join(f"{alias}.{quote(c)} IS NULL" for c in local_cols)
+    return f"({nulls} OR EXISTS (SELECT 1 FROM {parent} p WHERE {join}))"
+
+
+def _prune_stage(conn, quote, table_name: str, staged: Dict[str, List[str]]) -> int:
+    """Drop staged rows whose FK parent is missing from the parent's (already
+    pruned) stage, so each stage holds exactly the rows that should survive.
+
+    Run in FK order; returns the number of staged rows before pruning.
+    """
+    stage = quote(_stage_name(table_name))
+    file_rows = conn.exec_driver_sql(f"SELECT count(*) FROM {stage}").scalar()
+    matches = [
+        _parent_match_sql(
+            quote, local_cols, ref_cols, "s", quote(_stage_name(ref_table))
+        )
+        for local_cols, ref_table, ref_cols in _staged_parents(table_name, staged)
+        if schema_config.get_primary_key(ref_table)
+    ]
+    if matches:
+        conn.exec_driver_sql(
+            f"DELETE FROM {stage} s WHERE NOT (" + " AND ".join(matches) + ")"
+        )
+    return file_rows
+
+
+def _delete_removed(conn, quote, table: Table) -> int:
+    """Delete rows whose PK is no longer staged (left the file or lost its parent)."""
+    pk_cols = schema_config.get_primary_key(table.name)
+    stage = quote(_stage_name(table.name))
+    pk_match = " AND ".join(f"s.{quote(c)} = t.{quote(c)}" for c in pk_cols)
+    result = conn.exec_driver_sql(
+        f"DELETE FROM {quote(table.name)} t "
+        f"WHERE NOT EXISTS (SELECT 1 FROM {stage} s WHERE {pk_match})"
+    )
+    return result.rowcount
+
+
+def _upsert_changed(
+    conn, quote, table: Table, staged: Dict[str, List[str]]
+) -> Dict[str, int]:
+    """Apply updates (digest or value changes) and inserts from the stage table.
+
+    New rows are inserted only if their parents exist, for the declared FK
+    constraints as well as the schema_config FKs the loader enforces in
+    Python (e.g. fixtures -> building_res on (acct, bld_num)).
+    """
+    cols = staged[table.name]
+    pk_cols = schema_config.get_primary_key(table.name)
+    stage = quote(_stage_name(table.name))
+    target = quote(table.name)
+    pk_match = " AND ".join(f"t.{quote(c)} = s.{quote(c)}" for c in pk_cols)
+    value_cols = [c for c in cols if c not in pk_cols]
+    # Stage columns are TEXT; typed target columns need explicit casts
+    src = {
+        c: load._stage_select_list(table, [c], quote, "s", conn.dialect) for c in cols
+    }
+
+    has_digests = conn.exec_driver_sql(
+        f"SELECT 1 FROM {DIGEST_TABLE} WHERE table_name = %(t)s LIMIT 1",
+        {"t": table.name},
+    ).first()
+    updated = 0
+    if value_cols:
+        assignments = ", ".join(f"{quote(c)} = {src[c]}" for c in value_cols)
+        if has_digests:
+            changed = (
+                f"EXISTS (SELECT 1 FROM {DIGEST_TABLE} d WHERE d.table_name = %(t)s "
+                f"AND d.pk_key = s._pk_key AND d.digest <> s._digest)"
+            )
+        else:
+            # First delta run after a full load: compare the values themselves
+            changed = (
+                "("
+                + ", ".join(f"t.{quote(c)}" for c in value_cols)
+                + ") IS DISTINCT FROM ("
+                + ", ".join(src[c] for c in value_cols)
+                + ")"
+            )
+        updated = conn.exec_driver_sql(
+            f"UPDATE {target} t SET {assignments} FROM {stage} s "
+            f"WHERE {pk_match} AND {changed}",
+            {"t": table.name},
+        ).rowcount
+
+    col_list = ", ".join(quote(c) for c in cols)
+    select_list = ", ".join(src[c] for c in cols)
+    filters = [f"NOT EXISTS (SELECT 1 FROM {target} t WHERE {pk_match})"]
+    fk_filter = load._fk_filter_sql(table, cols, quote, "s")
+    if fk_filter:
+        filters.append(fk_filter)
+    for local_cols, ref_table, ref_cols in _staged_parents(table.name, staged):
+        filters.append(
+            _parent_match_sql(quote, local_cols, ref_cols, "s", quote(ref_table))
+        )
+    inserted = conn.exec_driver_sql(
+        f"INSERT INTO {target} ({col_list}) SELECT {select_list} FROM {stage} s "
+        f"WHERE " + " AND ".join(filters) + " ON CONFLICT DO NOTHING"
+    ).rowcount
+    present = conn.exec_driver_sql(
+        f"SELECT count(*) FROM {stage} s "
+        f"WHERE EXISTS (SELECT 1 FROM {target} t WHERE {pk_match})"
+    ).scalar()
+
+    conn.exec_driver_sql(
+        f"DELETE FROM {DIGEST_TABLE} d WHERE d.table_name = %(t)s AND NOT EXISTS "
+        f"(SELECT 1 FROM {stage} s WHERE s._pk_key = d.pk_key)",
+        {"t": table.name},
+    )
+    conn.exec_driver_sql(
+        f"INSERT INTO {DIGEST_TABLE} (table_name, pk_key, digest) "
+        f"SELECT %(t)s, _pk_key, _digest FROM {stage} "
+        f"ON CONFLICT (table_name, pk_key) DO UPDATE SET digest = EXCLUDED.digest "
+        f"WHERE {DIGEST_TABLE}.digest <> EXCLUDED.digest",
+        {"t": table.name},
+    )
+    return {
+        "inserted": inserted,
+        "updated": updated,
+        "unchanged": present - inserted - updated,
+    }
+
+
+def _replace_all(conn, quote, table: Table, cols: List[str]) -> Dict[str, int]:
+    """Tables without a PK cannot be diffed; replace their contents."""
+    deleted = conn.exec_driver_sql(f"DELETE FROM {quote(table.name)}").rowcount
+    col_list = ", ".join(quote(c) for c in cols)
+    select_list = load._stage_select_list(table, cols, quote, "s", conn.dialect)
+    inserted = conn.exec_driver_sql(
+        f"INSERT INTO {quote(table.name)} ({col_list}) "
+        f"SELECT {select_list} FROM {quote(_stage_name(table.name))} s"
+    ).rowcount
+    return {"inserted": inserted, "deleted": deleted, "replaced": True}
+
+
+def delta_load(
+    indir: str = "extracted",
+    db_uri: str | None = None,
+    workers: int = 1,
+    codebook_dir: str | Path = load.CODEBOOK_DIR_DEFAULT,
+    summary_path: str | Path | None = None,
+    rejects_dir: str | Path | None = load.REJECTS_DIR_DEFAULT,
+    from_zips: bool = False,
+) -> Dict[str, Dict[str, int]]:
+    """Apply only the row-level changes between the extracted files and the database.
+
+    Parameters
+    ----------
+    indir : str
+            Root directory containing extracted .txt data files.
+    db_uri : str | None
+            PostgreSQL URI. If None, read DATABASE_URL from the environment/.env.
+    workers : int
+            Number of files staged concurrently (process pool).
+    codebook_dir : str | Path
+            Directory containing *_columns.csv codebook files.
+    summary_path : str | Path | None
+            Where to write the per-table JSON change summary; defaults to
+            `delta_summary_<timestamp>.json` in the current directory.
+    rejects_dir : str | Path | None
+            Directory for values that fail numeric/int/date conversion.
+    from_zips : bool
+            Read the `.txt` members straight from the zip archives under indir.
+
+    Returns the per-table summary.
+    """
+    root = Path(indir)
+    if not root.exists():
+        raise FileNotFoundError(f"Input directory does not exist: {root}")
+    db_uri = load._resolve_db_uri(db_uri)
+    engine = load._create_engine(db_uri)
+    if engine.dialect.name != "postgresql":
+        raise ValueError("Delta loads require a PostgreSQL database URI.")
+
+    table_defs = load.discover_codebook_tables(Path(codebook_dir))
+    metadata = MetaData()
+    tables = {
+        name: load.build_table(metadata, name, cols)
+        for name, cols in table_defs.items()
+    }
+    # Create any tables that do not exist yet; existing data is kept
+    metadata.create_all(engine)
+    _ensure_digest_table(engine)
+
+    if from_zips:
+        data_files = load.find_zip_members(root)
+    else:
+        data_files = load.find_data_files(root)
+    order = load._topological_sort_tables(sorted(set(data_files) & set(tables)))
+    _log(f"Staging {len(order)} data files...")
+
+    quote = engine.dialect.identifier_preparer.quote
+    summary: Dict[str, Dict[str, int]] = {}
+    try:
+        staged: Dict[str, List[str]] = {}
+        if workers and workers > 1:
+            engine.dispose()
+            with ProcessPoolExecutor(max_workers=workers) as ex:
+                futures = [
+                    ex.submit(
+                        _stage_worker,
+                        db_uri,
+                        str(codebook_dir),
+                        name,
+                        data_files[name],
+                        str(rejects_dir) if rejects_dir is not None else None,
+                    )
+                    for name in order
+                ]
+                for fut in futures:
+                    try:
+                        name, cols = fut.result()
+                        staged[name] = cols
+                    except Exception as e:
+                        _log(f"Error staging: {e}")
+        else:
+            for name in order:
+                try:
+                    staged[name] = stage_table(
+                        engine, tables[name], data_files[name], rejects_dir
+                    )
+                except Exception as e:
+                    _log(f"Error staging {name}: {e}")
+        staged = {name: cols for name, cols in staged.items() if cols}
+
+        with engine.begin() as conn:
+            file_rows = {
+                name: _prune_stage(conn, quote, name, staged)
+                for name in order
+                if name in staged
+            }
+            # Children first so that deleting a parent never violates an FK
+            for name in reversed(order):
+                if name in staged and schema_config.get_primary_key(name):
+                    summary[name] = {
+                        "deleted": _delete_removed(conn, quote, tables[name])
+                    }
+            for name in order:
+                if name not in staged:
+                    continue
+                if schema_config.get_primary_key(name):
+                    summary[name].update(
+                        _upsert_changed(conn, quote, tables[name], staged)
+                    )
+                else:
+                    summary[name] = _replace_all(
+                        conn, quote, tables[name], staged[name]
+                    )
+                stats = summary[name]
+                stats["file_rows"] = file_rows[name]
+                if not stats.get("replaced"):
+                    # Orphans and rows rejected by FKs are neither stored nor changed
+                    stats["skipped"] = (
+                        file_rows[name]
+                        - stats["inserted"]
+                        - stats["updated"]
+                        - stats["unchanged"]
+                    )
+                _log(
+                    f"{name}: +{stats['inserted']} ~{stats.get('updated', 0)} "
+                    f"-{stats['deleted']} ({stats.get('unchanged', 0)} unchanged, "
+                    f"{stats.get('skipped', 0)} skipped)"
+                )
+    finally:
+        # Unlogged stage tables must not outlive the run, even a failed one
+        _drop_stages(engine, order)
+
+    if summary_path is None:
+        ts = datetime.utcnow().strftime("%Y%m%dT%H%M%SZ")
+        summary_path = f"delta_summary_{ts}.json"
+    with open(summary_path, "w", encoding="utf-8") as fh:
+        json.dump(
+            {"generated_at": datetime.utcnow().isoformat(), "tables": summary},
+            fh,
+            indent=2,
+        )
+    _log(f"Wrote change summary to {summary_path}")
+
+    try:
+        load._execute_post_load_setup(engine)
+    except Exception as e:
+        _log(f"Warning: Post-load setup failed: {e}")
+    engine.dispose()
+    return summary
@@ -12,15 +12,47 @@ Defaults:
         DIR: ./downloads
         WORKERS: 4
 
+Re-runs are incremental: each download keeps a `<file>.meta.json` sidecar with
+the server's ETag/Last-Modified for conditional requests, and interrupted
+downloads resume from their `.part` file with HTTP Range requests.
+
+Segmented downloads:
+        python download.py --use-named-list --year 2025 --segments 4
+        fetches each large file (when the server accepts byte ranges) as N
+        ranges over N connections at once, written into a preallocated file.
+
+Async engine:
+        python download.py --use-named-list --year 2025 --engine async --workers 32
+        runs every download on one asyncio event loop sharing a single
+        connection pool (at most --workers connections, --per-host per host)
+        and reports the aggregate throughput.
+
+Download cache:
+        python download.py --use-named-list --year 2025 --cache-dir ~/.cache/hcad
+        keeps every archive once in a SHA-256 content-addressed store (see
+        download_cache.py) and hard-links it into --outdir.
+
+Change detection:
+        python download.py --use-named-list --year 2025 --check-only
+        HEADs every URL in parallel, compares ETag/Last-Modified/Content-Length
+        with the sidecars of the last download and lists the changed files.
+        Exits 0 when something changed and 1 when nothing did, so a cron job
+        can skip the download/extract/load stages.
+
 Requires: requests, beautifulsoup4
-Optional: tqdm (for nicer progress bars)
+Optional: tqdm (for nicer progress bars), aiohttp (for the async engine)
 """
 
 from __future__ import annotations
 
 import argparse
+import asyncio
+import hashlib
+import json
 import os
+import threading
 import time
+from email.utils import parsedate_to_datetime
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import Iterable, Optional
 from tracing import trace_span, get_tracer, span_context
@@ -46,6 +78,13 @@ try:
 except Exception:
     HAS_TQDM = False
 
+try:
+    import aiohttp
+
+    HAS_AIOHTTP = True
+except Exception:
+    HAS_AIOHTTP = False
+
 from urllib.parse import urljoin, urlparse
 
 DEFAULT_URL = "https://hcad.org/pdata/pdata-property-downloads.html"
@@ -92,6 +131,11 @@ def download_year(
     filenames: Optional[list[str]] = None,
     base: str = "https://download.hcad.org/data/CAMA/{year}/{fname}",
     dry_run: bool = False,
+    segments: int = 1,
+    engine: str = "threads",
+    cache_dir: Optional[str] = None,
+    verify_cache: bool = False,
+    per_host: Optional[int] = None,
 ) -> list[str]:
     """Convenience function to download the default CAMA files for a given year.
 
@@ -102,6 +146,13 @@ def download_year(
             filenames: Optional list of filenames (defaults to `DEFAULT_FILENAMES`).
             base: URL template with `{year}` and `{fname}` placeholders.
             dry_run: If True, do not download; return the list of URLs.
+            segments: Concurrent byte ranges per large file (see `download_file`).
+            engine: Download engine (see `download_all`).
+            cache_dir: Fetch through this content-addressed download cache
+                    and hard-link the archives into outdir (see download_cache.py).
+            verify_cache: With cache_dir, re-hash each archive before linking it
+                    and evict any that no longer match their SHA-256.
+            per_host: Async engine connection cap per host (default: workers).
 
     Returns:
             List of downloaded file paths (or the list of URLs if `dry_run=True`).
@@ -113,7 +164,29 @@ def download_year(
     urls.extend(DEFAULT_ADDITIONAL_URLS)
     if dry_run:
         return urls
-    return download_all(urls, outdir, workers=workers)
+    if cache_dir:
+        # Imported lazily: download_cache imports this module
+        from download_cache import cached_download
+
+        return cached_download(
+            urls,
+            outdir,
+            cache_dir,
+            year=year,
+            workers=workers,
+            segments=segments,
+            engine=engine,
+            verify=verify_cache,
+            per_host=per_host,
+        )
+    return download_all(
+        urls,
+        outdir,
+        workers=workers,
+        segments=segments,
+        engine=engine,
+        per_host=per_host,
+    )
 
 
 @trace_span()
@@ -162,6 +235,345 @@ def filename_from_url(url: str, resp: Optional[requests.Response] = None) -> str
     return name
 
 
+# Sidecar holding a file's HTTP validators: `<file>.meta.json`
+META_SUFFIX = ".meta.json"
+# Segmented downloads never use ranges smaller than this
+MIN_SEGMENT_BYTES = 8 * 1024 * 1024
+USER_AGENT = "HCAD-zip-downloader/1.0 (+https://github.com)"
+DOWNLOAD_ENGINES = ("threads", "async")
+# Async engine: bytes per network read, and bytes collected before each write
+# (and hash update), which runs on the loop's default thread pool
+ASYNC_CHUNK_SIZE = 64 * 1024
+ASYNC_WRITE_BUFFER = 1024 * 1024
+
+
+def _session(pool_size: int = 10) -> requests.Session:
+    """A Session whose connection pool fits pool_size concurrent requests per host."""
+    session = requests.Session()
+    session.headers.update({"User-Agent": USER_AGENT})
+    adapter = requests.adapters.HTTPAdapter(
+        pool_connections=pool_size, pool_maxsize=pool_size
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def _read_meta(path: str) -> Optional[dict]:
+    try:
+        with open(path + META_SUFFIX, "r", encoding="utf-8") as fh:
+            return json.load(fh)
+    except (OSError, ValueError):
+        return None
+
+
+def _write_meta(path: str, meta: dict) -> None:
+    tmp = path + META_SUFFIX + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as fh:
+        json.dump(meta, fh, indent=2)
+    os.replace(tmp, path + META_SUFFIX)
+
+
+def _remove(path: str) -> None:
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+def _if_range(meta: dict) -> Optional[str]:
+    """Validator usable in If-Range: a strong ETag, else Last-Modified."""
+    etag = meta.get("etag")
+    if etag and not etag.startswith("W/"):
+        return etag
+    return meta.get("last_modified")
+
+
+def _response_meta(url: str, resp: requests.Response, size: Optional[int]) -> dict:
+    return {
+        "url": url,
+        "etag": resp.headers.get("ETag"),
+        "last_modified": resp.headers.get("Last-Modified"),
+        "size": size,
+    }
+
+
+def _adopt_existing(path: str, resp: requests.Response) -> bool:
+    """Whether an existing file without a sidecar (or from a server without
+    validators) can be kept: same size as the response and, when the server
+    sends Last-Modified, not older than it."""
+    remote_size = resp.headers.get("Content-Length")
+    try:
+        if remote_size is None or os.path.getsize(path) != int(remote_size):
+            return False
+    except ValueError:
+        return False
+    last_modified = resp.headers.get("Last-Modified")
+    if last_modified:
+        try:
+            remote_mtime = parsedate_to_datetime(last_modified).timestamp()
+        except (TypeError, ValueError):
+            return False
+        return os.path.getmtime(path) >= remote_mtime
+    return True
+
+
+def _conditional_headers(url: str, outpath: str) -> tuple[dict, Optional[dict]]:
+    """Request headers for url (conditional on the sidecar of a completed
+    outpath, if any) and that sidecar."""
+    headers = {"Accept-Encoding": "identity"}  # byte offsets must match the file
+    meta = _read_meta(outpath) if os.path.exists(outpath) else None
+    if meta and meta.get("url") == url:
+        if meta.get("etag"):
+            headers["If-None-Match"] = meta["etag"]
+        if meta.get("last_modified"):
+            headers["If-Modified-Since"] = meta["last_modified"]
+    return headers, meta
+
+
+def _split_segments(size: int, count: int) -> list[list[int]]:
+    """[start, end (inclusive), bytes done] for count near-equal ranges of size bytes."""
+    step = -(-size // count)
+    return [[start, min(start + step, size) - 1, 0] for start in range(0, size, step)]
+
+
+def _download_segmented(
+    url: str, outdir: str, session: requests.Session, chunk_size: int, segments: int
+) -> Optional[str]:
+    """Fetch url as concurrent byte ranges into a preallocated `.part` file.
+
+    Returns None when the file should be fetched as a single stream instead:
+    the server does not accept ranges or offer a validator, or the file is
+    too small to split. Segment progress is saved in the `.part` sidecar when
+    an attempt fails, so the next attempt only fetches the missing bytes.
+    """
+    outpath = os.path.join(outdir, filename_from_url(url))
+    part = outpath + ".part"
+    headers, meta = _conditional_headers(url, outpath)
+    head = session.head(url, allow_redirects=True, timeout=30, headers=headers)
+    if head.status_code == 304:
+        _remove(part)
+        _remove(part + META_SUFFIX)
+        return outpath
+    if not head.ok or head.headers.get("Accept-Ranges", "").lower() != "bytes":
+        return None
+    try:
+        size = int(head.headers["Content-Length"])
+    except (KeyError, ValueError):
+        return None
+    validator = _if_range(_response_meta(url, head, size))
+    count = min(segments, size // MIN_SEGMENT_BYTES)
+    if not validator or count < 2:
+        return None
+    finalpath = os.path.join(outdir, filename_from_url(url, head))
+    if (
+        os.path.exists(finalpath)
+        and not (meta and meta.get("url") == url)
+        and _adopt_existing(finalpath, head)
+    ):
+        _write_meta(finalpath, _response_meta(url, head, size))
+        return finalpath
+
+    part_meta = _read_meta(part) if os.path.exists(part) else None
+    if (
+        part_meta
+        and part_meta.get("url") == url
+        and part_meta.get("size") == size
+        and part_meta.get("segments")
+        and _if_range(part_meta) == validator
+    ):
+        ranges = part_meta["segments"]
+    else:
+        ranges = _split_segments(size, count)
+        with open(part, "wb") as fh:
+            fh.truncate(size)
+    part_meta = {**_response_meta(url, head, size), "segments": ranges}
+    _write_meta(part, part_meta)
+
+    pbar = None
+    if HAS_TQDM:
+        pbar = tqdm(
+            total=size,
+            initial=sum(done for _s, _e, done in ranges),
+            unit="B",
+            unit_scale=True,
+            unit_divisor=1024,
+            leave=False,
+            desc=os.path.basename(finalpath),
+        )
+    pbar_lock = threading.Lock()
+    changed = threading.Event()
+
+    def _fetch(seg: list[int]) -> None:
+        start, end, _done = seg
+        if start + seg[2] > end:
+            return
+        range_headers = {
+            "Accept-Encoding": "identity",
+            "Range": f"bytes={start + seg[2]}-{end}",
+            "If-Range": validator,
+        }
+        with session.get(url, stream=True, timeout=30, headers=range_headers) as r:
+            r.raise_for_status()
+            content_range = r.headers.get("Content-Range", "")
+            if r.status_code != 206 or not content_range.startswith(
+                f"bytes {start + seg[2]}-"
+            ):
+                changed.set()  # If-Range failed: the file changed on the server
+                raise IOError(f"{url} changed during a segmented download")
+            with open(part, "r+b") as fh:
+                fh.seek(start + seg[2])
+                for chunk in r.iter_content(chunk_size=chunk_size):
+                    if chunk:
+                        fh.write(chunk)
+                        seg[2] += len(chunk)
+                        if pbar is not None:
+                            with pbar_lock:
+                                pbar.update(len(chunk))
+        if start + seg[2] <= end:
+            raise IOError(f"Incomplete segment {start}-{end} of {url}")
+
+    try:
+        with ThreadPoolExecutor(max_workers=len(ranges)) as ex:
+            for fut in [ex.submit(_fetch, seg) for seg in ranges]:
+                fut.result()
+    except Exception:
+        if changed.is_set():
+            _remove(part)
+            _remove(part + META_SUFFIX)
+        else:
+            _write_meta(part, part_meta)
+        raise
+    finally:
+        if pbar is not None:
+            pbar.close()
+    # Ranges arrive out of order, so the file is hashed once it is complete
+    return _finish_part(url, part, finalpath, head, size, file_sha256(part))
+
+
+def _resume_request(url: str, outpath: str) -> tuple[dict, Optional[dict], int]:
+    """Headers for fetching url into outpath, the completed file's sidecar,
+    and the `.part` offset the request resumes from (0 for a fresh start)."""
+    part = outpath + ".part"
+    headers, meta = _conditional_headers(url, outpath)
+    offset = os.path.getsize(part) if os.path.exists(part) else 0
+    part_meta = _read_meta(part) if offset else None
+    if (
+        part_meta
+        and part_meta.get("url") == url
+        # A preallocated segmented .part is not a prefix of the file
+        and "segments" not in part_meta
+    ):
+        if_range = _if_range(part_meta)
+    else:
+        if_range = None
+    if offset and if_range:
+        headers["Range"] = f"bytes={offset}-"
+        headers["If-Range"] = if_range
+    else:
+        offset = 0
+    return headers, meta, offset
+
+
+def file_sha256(path: str, digest=None):
+    """Hash the file at path into digest (a new SHA-256 by default) and return it."""
+    digest = digest or hashlib.sha256()
+    with open(path, "rb") as fh:
+        for block in iter(lambda: fh.read(1024 * 1024), b""):
+            digest.update(block)
+    return digest
+
+
+def _part_digest(part: str, offset: int):
+    """SHA-256 state for a download writing at offset into part: resumed
+    downloads hash the bytes already on disk, fresh ones start empty."""
+    return file_sha256(part) if offset else hashlib.sha256()
+
+
+def _finish_part(
+    url: str, part: str, finalpath: str, resp, total: Optional[int], digest
+) -> str:
+    """Move a fully written `.part` into place with its final sidecar, which
+    records the SHA-256 hashed while the bytes streamed in."""
+    size = os.path.getsize(part)
+    if total is not None and size != total:
+        # Connection dropped early; the next attempt resumes from here
+        raise IOError(f"Incomplete download of {url}: {size} of {total} bytes")
+    os.replace(part, finalpath)
+    meta = _response_meta(url, resp, size)
+    meta["sha256"] = digest.hexdigest()
+    _write_meta(finalpath, meta)
+    _remove(part + META_SUFFIX)
+    return finalpath
+
+
+def _download_once(
+    url: str, outdir: str, session: requests.Session, chunk_size: int
+) -> str:
+    # The .part file and conditional headers are keyed by the URL's file name;
+    # the final name may still come from Content-Disposition.
+    outpath = os.path.join(outdir, filename_from_url(url))
+    part = outpath + ".part"
+    headers, meta, offset = _resume_request(url, outpath)
+
+    with session.get(url, stream=True, timeout=30, headers=headers) as r:
+        if r.status_code == 304:
+            # Unchanged since the last complete download; any .part is stale
+            _remove(part)
+            _remove(part + META_SUFFIX)
+            return outpath
+        r.raise_for_status()
+        finalpath = os.path.join(outdir, filename_from_url(url, r))
+        if r.status_code == 206:
+            content_range = r.headers.get("Content-Range", "")
+            if not content_range.startswith(f"bytes {offset}-"):
+                # Unusable partial response: drop the .part so the retry starts over
+                _remove(part)
+                raise IOError(f"Unexpected Content-Range {content_range!r} for {url}")
+        else:
+            offset = 0  # full body: the server ignored Range or the file changed
+            if (
+                os.path.exists(finalpath)
+                and not (meta and meta.get("url") == url)
+                and _adopt_existing(finalpath, r)
+            ):
+                # Downloaded before sidecars existed (or no validators offered)
+                _write_meta(
+                    finalpath, _response_meta(url, r, os.path.getsize(finalpath))
+                )
+                return finalpath
+        remaining = r.headers.get("Content-Length")
+        try:
+            total = offset + int(remaining) if remaining is not None else None
+        except ValueError:
+            total = None
+        _write_meta(part, _response_meta(url, r, total))
+        pbar = None
+        if HAS_TQDM and total:
+            pbar = tqdm(
+                total=total,
+                initial=offset,
+                unit="B",
+                unit_scale=True,
+                unit_divisor=1024,
+                leave=False,
+                desc=os.path.basename(finalpath),
+            )
+        digest = _part_digest(part, offset)
+        try:
+            with open(part, "ab" if offset else "wb") as fh:
+                for chunk in r.iter_content(chunk_size=chunk_size):
+                    if chunk:
+                        fh.write(chunk)
+                        digest.update(chunk)
+                        if pbar is not None:
+                            pbar.update(len(chunk))
+        finally:
+            if pbar is not None:
+                pbar.close()
+    return _finish_part(url, part, finalpath, r, total, digest)
+
+
 @trace_span()
 def download_file(
     url: str,
@@ -169,59 +581,30 @@ def download_file(
     session: requests.Session,
     chunk_size: int = 8192,
     retry: int = 3,
+    segments: int = 1,
 ) -> str:
     """Download a single file, with retries.
 
+    Downloads are conditional and resumable. A completed file gets a
+    `<file>.meta.json` sidecar with the server's ETag/Last-Modified, and later
+    runs send If-None-Match/If-Modified-Since and keep the file on 304 Not
+    Modified. Bytes stream into `<file>.part` (with its own sidecar), so a
+    retry or a later run continues from the last byte written with a Range
+    request; If-Range makes the server send the whole file instead if it
+    changed in between.
+
+    With segments > 1, files of at least 2 * MIN_SEGMENT_BYTES from servers
+    that accept byte ranges are fetched as up to `segments` concurrent ranges.
+
     Returns: path to the file on disk.
     """
     for attempt in range(1, retry + 1):
         try:
-            r = session.get(url, stream=True, timeout=30)
-            r.raise_for_status()
-            fname = filename_from_url(url, r)
-            outpath = os.path.join(outdir, fname)
-            # If file exists and size matches, skip
-            if os.path.exists(outpath):
-                remote_size = r.headers.get("Content-Length")
-                if remote_size is not None:
-                    try:
-                        remote_size = int(remote_size)
-                    except Exception:
-                        remote_size = None
-                if remote_size is None or os.path.getsize(outpath) == remote_size:
-                    return outpath
-            # Stream write to file
-            total = None
-            content_length = r.headers.get("Content-Length")
-            if content_length is not None:
-                try:
-                    total = int(content_length)
-                except Exception:
-                    total = None
-            if HAS_TQDM and total:
-                with (
-                    open(outpath + ".part", "wb") as fh,
-                    tqdm(
-                        total=total,
-                        unit="B",
-                        unit_scale=True,
-                        unit_divisor=1024,
-                        leave=False,
-                        desc=fname,
-                    ) as pbar,
-                ):
-                    for chunk in r.iter_content(chunk_size=chunk_size):
-                        if chunk:
-                            fh.write(chunk)
-                            pbar.update(len(chunk))
-                os.replace(outpath + ".part", outpath)
-            else:
-                with open(outpath + ".part", "wb") as fh:
-                    for chunk in r.iter_content(chunk_size=chunk_size):
-                        if chunk:
-                            fh.write(chunk)
-                os.replace(outpath + ".part", outpath)
-            return outpath
+            if segments > 1:
+                path = _download_segmented(url, outdir, session, chunk_size, segments)
+                if path is not None:
+                    return path
+            return _download_once(url, outdir, session, chunk_size)
         except Exception as e:
             if attempt < retry:
                 time.sleep(1 * attempt)
@@ -231,35 +614,266 @@ def download_file(
     raise RuntimeError(f"Failed to download {url} after {retry} attempts")
 
 
-@trace_span()
-def download_all(urls: Iterable[str], outdir: str, workers: int = 4) -> list[str]:
-    os.makedirs(outdir, exist_ok=True)
+def _write_hashed(fh, digest, data: bytes) -> None:
+    fh.write(data)
+    digest.update(data)
+
+
+async def _download_once_async(
+    url: str,
+    outdir: str,
+    session: "aiohttp.ClientSession",
+    chunk_size: int,
+    stats: dict,
+) -> str:
+    """`_download_once` on aiohttp: same sidecars, conditional requests and
+    `.part` resume. Disk writes and hashing run in worker threads
+    (asyncio.to_thread), so one download's I/O never stalls the others."""
+    outpath = os.path.join(outdir, filename_from_url(url))
+    part = outpath + ".part"
+    headers, meta, offset = _resume_request(url, outpath)
+
+    async with session.get(url, headers=headers) as r:
+        if r.status == 304:
+            _remove(part)
+            _remove(part + META_SUFFIX)
+            return outpath
+        r.raise_for_status()
+        finalpath = os.path.join(outdir, filename_from_url(url, r))
+        if r.status == 206:
+            content_range = r.headers.get("Content-Range", "")
+            if not content_range.startswith(f"bytes {offset}-"):
+                _remove(part)
+                raise IOError(f"Unexpected Content-Range {content_range!r} for {url}")
+        else:
+            offset = 0
+            if (
+                os.path.exists(finalpath)
+                and not (meta and meta.get("url") == url)
+                and _adopt_existing(finalpath, r)
+            ):
+                _write_meta(
+                    finalpath, _response_meta(url, r, os.path.getsize(finalpath))
+                )
+                return finalpath
+        total = offset + r.content_length if r.content_length is not None else None
+        _write_meta(part, _response_meta(url, r, total))
+        # Re-hashing a resumed multi-GB .part must not block the event loop
+        digest = await asyncio.to_thread(_part_digest, part, offset)
+        fh = await asyncio.to_thread(open, part, "ab" if offset else "wb")
+        try:
+            buf = bytearray()
+            async for chunk in r.content.iter_chunked(chunk_size):
+                buf += chunk
+                stats["bytes"] += len(chunk)
+                if len(buf) >= ASYNC_WRITE_BUFFER:
+                    data, buf = buf, bytearray()
+                    await asyncio.to_thread(_write_hashed, fh, digest, data)
+            if buf:
+                await asyncio.to_thread(_write_hashed, fh, digest, buf)
+        finally:
+            await asyncio.to_thread(fh.close)
+    return await asyncio.to_thread(_finish_part, url, part, finalpath, r, total, digest)
+
+
+async def _download_all_async(
+    jobs: list[tuple[str, str]],
+    workers: int,
+    per_host: Optional[int],
+    retry: int = 3,
+) -> list[tuple[str, str]]:
+    """Download (url, outdir) jobs concurrently on one event loop. A single
+    connector caps open connections at workers (per_host per host); extra
+    downloads wait for a free connection rather than a thread."""
+    connector = aiohttp.TCPConnector(limit=workers, limit_per_host=per_host or workers)
+    timeout = aiohttp.ClientTimeout(sock_connect=30, sock_read=30)
+    stats = {"bytes": 0}
     results = []
-    with requests.Session() as session:
-        session.headers.update(
-            {"User-Agent": "HCAD-zip-downloader/1.0 (+https://github.com)"}
+
+    async def _one(url: str, outdir: str, session: "aiohttp.ClientSession"):
+        for attempt in range(1, retry + 1):
+            try:
+                path = await _download_once_async(
+                    url, outdir, session, ASYNC_CHUNK_SIZE, stats
+                )
+                return url, path, None
+            except Exception as e:
+                if attempt == retry:
+                    return url, None, e
+                await asyncio.sleep(1 * attempt)
+
+    start = time.perf_counter()
+    async with aiohttp.ClientSession(
+        connector=connector,
+        timeout=timeout,
+        headers={"User-Agent": USER_AGENT},
+        auto_decompress=False,
+    ) as session:
+        pending = asyncio.as_completed([_one(u, d, session) for u, d in jobs])
+        if HAS_TQDM:
+            pending = tqdm(pending, total=len(jobs), desc="Downloading")
+        for fut in pending:
+            url, path, error = await fut
+            if error is not None:
+                print(f"Error downloading {url}: {error}")
+            else:
+                results.append((url, path))
+    elapsed = time.perf_counter() - start
+    mib = stats["bytes"] / (1024 * 1024)
+    print(
+        f"Fetched {mib:,.1f} MiB in {elapsed:.1f}s ({mib / max(elapsed, 1e-9):,.1f} MiB/s)"
+        f" over at most {workers} connections"
+    )
+    return results
+
+
+@trace_span()
+def download_all(
+    urls: Iterable[str],
+    outdir: str,
+    workers: int = 4,
+    segments: int = 1,
+    engine: str = "threads",
+    per_host: Optional[int] = None,
+) -> list[str]:
+    """Download urls into outdir and return the paths that succeeded.
+
+    Args:
+            urls: File URLs to download.
+            outdir: Directory to save downloads.
+            workers: Parallel downloads (threads), or the total connection
+                    cap of the async engine.
+            segments: Concurrent byte ranges per large file (threads engine
+                    only; see `download_file`).
+            engine: One of `DOWNLOAD_ENGINES`. "async" needs aiohttp.
+            per_host: Async engine connection cap per host (default: workers).
+    """
+    jobs = [(u, outdir) for u in urls]
+    fetched = _download_jobs(jobs, workers, segments, engine, per_host)
+    return [path for _url, path in fetched]
+
+
+def _download_jobs(
+    jobs: list[tuple[str, str]],
+    workers: int = 4,
+    segments: int = 1,
+    engine: str = "threads",
+    per_host: Optional[int] = None,
+) -> list[tuple[str, str]]:
+    """`download_all` for (url, outdir) jobs; returns (url, path) per success."""
+    if engine not in DOWNLOAD_ENGINES:
+        raise ValueError(
+            f"Unknown download engine {engine!r}; use one of {DOWNLOAD_ENGINES}"
         )
+    for outdir in {d for _u, d in jobs}:
+        os.makedirs(outdir, exist_ok=True)
+    if engine == "async":
+        if not HAS_AIOHTTP:
+            raise RuntimeError(
+                "The async download engine requires aiohttp. Install with `pip install aiohttp`."
+            )
+        if segments > 1:
+            raise ValueError("Segmented downloads require the threads engine.")
+        return asyncio.run(_download_all_async(jobs, workers, per_host))
+    results = []
+    with _session(max(10, workers * segments)) as session:
         with ThreadPoolExecutor(max_workers=workers) as ex:
-            futures = {ex.submit(download_file, u, outdir, session): u for u in urls}
+            futures = {
+                ex.submit(download_file, u, d, session, segments=segments): u
+                for u, d in jobs
+            }
             if HAS_TQDM:
                 for fut in tqdm(
                     as_completed(futures), total=len(futures), desc="Downloading"
                 ):
                     try:
                         path = fut.result()
-                        results.append(path)
+                        results.append((futures[fut], path))
                     except Exception as e:
                         print(f"Error downloading {futures[fut]}: {e}")
             else:
                 for fut in as_completed(futures):
                     try:
                         path = fut.result()
-                        results.append(path)
+                        results.append((futures[fut], path))
                     except Exception as e:
                         print(f"Error downloading {futures[fut]}: {e}")
     return results
 
 
+def _remote_changed(meta: Optional[dict], resp: requests.Response) -> bool:
+    """Whether a HEAD response describes a different file than the sidecar
+    of the last completed download."""
+    if not meta:
+        return True
+    etag = resp.headers.get("ETag")
+    last_modified = resp.headers.get("Last-Modified")
+    length = resp.headers.get("Content-Length")
+    if not (etag or last_modified or length):
+        return True  # nothing to compare against
+    if etag and meta.get("etag") and etag != meta["etag"]:
+        return True
+    if last_modified and meta.get("last_modified"):
+        if last_modified != meta["last_modified"]:
+            return True
+    if length is not None and meta.get("size") is not None:
+        try:
+            return int(length) != meta["size"]
+        except ValueError:
+            return True
+    return False
+
+
+@trace_span()
+def check_for_changes(
+    urls: Iterable[str],
+    outdir: str,
+    workers: int = 8,
+    cache_dir: Optional[str] = None,
+) -> list[str]:
+    """HEAD every URL in parallel and return the ones whose file changed.
+
+    A URL counts as changed when there is no completed download of it in
+    outdir (or in the download cache, with cache_dir), when the server's
+    ETag, Last-Modified or Content-Length differ from that download's
+    sidecar, or when the HEAD request fails.
+
+    Returns:
+            Changed URLs, in the order given.
+    """
+    urls = list(urls)
+    if cache_dir:
+        from download_cache import staging_dir
+
+        # Same expansion as cached_download, so ~/cache finds the same files
+        cache_dir = os.path.expanduser(cache_dir)
+
+    def _check(url: str, session: requests.Session) -> bool:
+        resp = session.head(url, allow_redirects=True, timeout=30)
+        if not resp.ok:
+            print(f"HEAD {url} returned {resp.status_code}; treating it as changed")
+            return True
+        directory = staging_dir(cache_dir, url) if cache_dir else outdir
+        path = os.path.join(directory, filename_from_url(url, resp))
+        meta = _read_meta(path) if os.path.exists(path) else None
+        if meta and meta.get("url") != url:
+            meta = None
+        return _remote_changed(meta, resp)
+
+    changed = set()
+    with _session(max(10, workers)) as session:
+        with ThreadPoolExecutor(max_workers=workers) as ex:
+            futures = {ex.submit(_check, u, session): u for u in urls}
+            for fut in as_completed(futures):
+                try:
+                    if fut.result():
+                        changed.add(futures[fut])
+                except Exception as e:
+                    print(f"Error checking {futures[fut]}: {e}; treating it as changed")
+                    changed.add(futures[fut])
+    return [u for u in urls if u in changed]
+
+
 @trace_span()
 def main():
     parser = argparse.ArgumentParser(
@@ -290,12 +904,45 @@ def main():
         default=None,
         help="Year to use when building URLs with --use-named-list (e.g. 2025)",
     )
+    parser.add_argument(
+        "--segments",
+        type=int,
+        default=1,
+        help="Fetch each large file as N concurrent byte ranges (server must accept ranges)",
+    )
+    parser.add_argument(
+        "--engine",
+        choices=DOWNLOAD_ENGINES,
+        default="threads",
+        help="Download on a thread pool, or on one asyncio event loop (needs aiohttp)",
+    )
+    parser.add_argument(
+        "--per-host",
+        type=int,
+        default=None,
+        help="Async engine: maximum connections per host (default: --workers)",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        type=str,
+        default=None,
+        help="Fetch through this SHA-256 content-addressed cache and hard-link into --outdir",
+    )
+    parser.add_argument(
+        "--verify-cache",
+        action="store_true",
+        help="With --cache-dir, re-hash each archive before linking it and evict corrupt ones",
+    )
+    parser.add_argument(
+        "--check-only",
+        action="store_true",
+        help="Only HEAD the files and list those changed since the last download (exit 1 if none)",
+    )
     args = parser.parse_args()
+    if args.verify_cache and not args.cache_dir:
+        parser.error("--verify-cache requires --cache-dir")
 
-    with requests.Session() as session:
-        session.headers.update(
-            {"User-Agent": "HCAD-zip-downloader/1.0 (+https://github.com)"}
-        )
+    with _session() as session:
         if args.use_named_list:
             if args.year is None:
                 print("Error: --year is required when using --use-named-list")
@@ -316,8 +963,38 @@ def main():
         if args.dry_run:
             print("Dry run: not downloading.")
             return
+        if args.check_only:
+            changed = check_for_changes(
+                zip_urls, args.outdir, workers=args.workers, cache_dir=args.cache_dir
+            )
+            print(f"{len(changed)} of {len(zip_urls)} file(s) changed:")
+            for z in changed:
+                print("  ", z)
+            raise SystemExit(0 if changed else 1)
         print(f"Downloading into: {args.outdir} (workers={args.workers})")
-        downloaded = download_all(zip_urls, args.outdir, workers=args.workers)
+        if args.cache_dir:
+            from download_cache import cached_download
+
+            downloaded = cached_download(
+                zip_urls,
+                args.outdir,
+                args.cache_dir,
+                year=args.year,
+                workers=args.workers,
+                segments=args.segments,
+                engine=args.engine,
+                verify=args.verify_cache,
+                per_host=args.per_host,
+            )
+        else:
+            downloaded = download_all(
+                zip_urls,
+                args.outdir,
+                workers=args.workers,
+                segments=args.segments,
+                engine=args.engine,
+                per_host=args.per_host,
+            )
         print(f"Downloaded {len(downloaded)} file(s).")
 
 
@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+"""Content-addressed download cache.
+
+Downloading every year into its own --outdir by bare file name means years
+collide unless directories are juggled, and nothing notices a corrupted
+archive before extraction. cached_download() fetches each URL into a staging
+tree inside the cache (one directory per URL path, so years never collide and
+the usual `.meta.json` conditional requests and `.part` resume still apply),
+then stores the file once under its SHA-256 and hard-links it into outdir.
+
+Layout of a cache directory:
+    files/<host>/<url path>/<file>   staged download and its sidecars
+    objects/<sha[:2]>/<sha>          one hard link per distinct archive
+    index.json                       sha256 -> url, year, etag, size, ...
+
+The SHA-256 is computed while the bytes stream in (see download.py) and kept
+in the file's sidecar, so storing a download costs no extra read. Objects
+share their inode with the staged file and the outdir links: treat them as
+read-only. `python download_cache.py --cache-dir DIR --verify` re-hashes every
+object and evicts any that no longer match, so the next run downloads them
+again.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import shutil
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional
+from urllib.parse import urlparse
+
+import download
+
+# Bump when the index layout changes; an index of another version is ignored.
+CACHE_INDEX_VERSION = 1
+CACHE_INDEX_FILE = "index.json"
+
+
+def _log(msg: str) -> None:
+    print(f"[download_cache] {msg}")
+
+
+def object_path(cache_dir: str | Path, sha256: str) -> Path:
+    return Path(cache_dir) / "objects" / sha256[:2] / sha256
+
+
+def staging_dir(cache_dir: str | Path, url: str) -> Path:
+    """Directory a URL is downloaded into: files/<host>/<directories of the path>."""
+    parsed = urlparse(url)
+    parts = [p for p in parsed.path.split("/")[:-1] if p not in ("", ".", "..")]
+    return Path(cache_dir, "files", parsed.netloc or "local", *parts)
+
+
+def load_index(cache_dir: str | Path) -> Dict[str, Any]:
+    index_path = Path(cache_dir) / CACHE_INDEX_FILE
+    try:
+        index = json.loads(index_path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        index = None
+    if not isinstance(index, dict) or index.get("version") != CACHE_INDEX_VERSION:
+        index = {"version": CACHE_INDEX_VERSION, "objects": {}}
+    return index
+
+
+def _write_index(cache_dir: str | Path, index: Dict[str, Any]) -> None:
+    index_path = Path(cache_dir) / CACHE_INDEX_FILE
+    tmp_path = index_path.with_name(f"{index_path.name}.{os.getpid()}.tmp")
+    tmp_path.write_text(json.dumps(index, indent=2, sort_keys=True), encoding="utf-8")
+    os.replace(tmp_path, index_path)
+
+
+def _link(src: Path, dest: Path) -> None:
+    """Point dest at src's bytes: a hard link, or a copy across filesystems."""
+    if dest.exists() and os.path.samefile(src, dest):
+        return
+    dest.parent.mkdir(parents=True, exist_ok=True)
+    tmp = dest.with_name(dest.name + ".tmp")
+    tmp.unlink(missing_ok=True)
+    try:
+        os.link(src, tmp)
+    except OSError:
+        shutil.copy2(src, tmp)
+    os.replace(tmp, dest)
+
+
+def store(
+    cache_dir: str | Path,
+    url: str,
+    path: str | Path,
+    index: Dict[str, Any],
+    year: Optional[int] = None,
+) -> str:
+    """Add a downloaded file to the object store and index; return its SHA-256."""
+    path = Path(path)
+    meta = download._read_meta(str(path)) or {}
+    sha256 = meta.get("sha256")
+    if not sha256:
+        # Downloaded before hashes were recorded (or adopted as-is): hash once
+        sha256 = download.file_sha256(str(path)).hexdigest()
+        if meta.get("url") == url:
+            download._write_meta(str(path), {**meta, "sha256": sha256})
+    obj = object_path(cache_dir, sha256)
+    if not obj.exists():
+        _link(path, obj)
+    index["objects"][sha256] = {
+        "url": url,
+        "year": year,
+        "etag": meta.get("etag"),
+        "last_modified": meta.get("last_modified"),
+        "size": path.stat().st_size,
+        "filename": path.name,
+        "staged": path.relative_to(cache_dir).as_posix(),
+        "stored_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+    }
+    return sha256
+
+
+def _evict(cache_dir: str | Path, sha256: str, index: Dict[str, Any]) -> None:
+    """Drop an object, its index entry and a staged file holding the same bytes."""
+    entry = index["objects"].pop(sha256, None)
+    object_path(cache_dir, sha256).unlink(missing_ok=True)
+    if entry and entry.get("staged"):
+        staged = Path(cache_dir) / entry["staged"]
+        meta = download._read_meta(str(staged))
+        if meta and meta.get("sha256") == sha256:
+            staged.unlink(missing_ok=True)
+            Path(str(staged) + download.META_SUFFIX).unlink(missing_ok=True)
+
+
+def verify_cache(cache_dir: str | Path) -> list[str]:
+    """Re-hash every indexed object; evict and return the ones that do not match."""
+    cache_dir = Path(cache_dir).expanduser()
+    index = load_index(cache_dir)
+    bad = []
+    for sha256 in sorted(index["objects"]):
+        obj = object_path(cache_dir, sha256)
+        if not obj.exists() or download.file_sha256(str(obj)).hexdigest() != sha256:
+            bad.append(sha256)
+    for sha256 in bad:
+        _log(f"Evicting corrupt object {sha256} ({index['objects'][sha256]['url']})")
+        _evict(cache_dir, sha256, index)
+    _write_index(cache_dir, index)
+    return bad
+
+
+def cached_download(
+    urls: Iterable[str],
+    outdir: str,
+    cache_dir: str | Path,
+    year: Optional[int] = None,
+    workers: int = 4,
+    segments: int = 1,
+    engine: str = "threads",
+    verify: bool = False,
+    per_host: Optional[int] = None,
+) -> list[str]:
+    """Download urls through the cache and hard-link the archives into outdir.
+
+    Args:
+            urls: File URLs to download.
+            outdir: Directory that receives a link to each archive.
+            cache_dir: Root of the content-addressed cache.
+            year: Recorded in the index next to each archive.
+            workers, segments, engine: As for `download.download_all`.
+            verify: Re-hash each archive before linking it, and evict (rather
+                    than link) any whose bytes no longer match their SHA-256.
+            per_host: Async engine connection cap per host (default: workers).
+
+    Returns:
+            Paths of the archives linked into outdir.
+    """
+    cache_dir = Path(cache_dir).expanduser()
+    jobs = [(u, str(staging_dir(cache_dir, u))) for u in urls]
+    fetched = download._download_jobs(jobs, workers, segments, engine, per_host)
+    index = load_index(cache_dir)
+    results = []
+    for url, path in fetched:
+        sha256 = store(cache_dir, url, path, index, year=year)
+        obj = object_path(cache_dir, sha256)
+        if verify and download.file_sha256(str(obj)).hexdigest() != sha256:
+            _log(f"Corrupt archive from {url}; evicted, re-run to download it again")
+            _evict(cache_dir, sha256, index)
+            continue
+        dest = Path(outdir) / Path(path).name
+        _link(obj, dest)
+        results.append(str(dest))
+    _write_index(cache_dir, index)
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Inspect or verify a download cache.")
+    parser.add_argument("--cache-dir", required=True, help="Download cache directory")
+    parser.add_argument(
+        "--verify",
+        action="store_true",
+        help="Re-hash every object and evict the ones that do not match",
+    )
+    args = parser.parse_args()
+    if args.verify:
+        bad = verify_cache(args.cache_dir)
+        print(f"{len(bad)} corrupt object(s) evicted.")
+        return
+    for sha256, entry in sorted(
+        load_index(args.cache_dir)["objects"].items(),
+        key=lambda item: (item[1].get("year") or 0, item[1]["url"]),
+    ):
+        print(
+            f"{sha256[:12]}  {entry['size']:>14,}  {entry.get('year') or '-'}  {entry['url']}"
+        )
+
+
+if __name__ == "__main__":
+    main()
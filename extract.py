@@ -25,13 +25,33 @@ Cleaning behavior:
     clean, reproducible state.
 
 GIS handling:
-    GIS_Public.zip is extracted first into `gis_data/` then any nested zips
-    discovered below `gis_data/GIS_Public` are extracted into `gis_data/` as
-    peer folders.
+    GIS_Public.zip is extracted into `gis_data/` and every zip nested inside it
+    is extracted into `gis_data/` as a peer folder. All archives share one
+    work queue of --workers threads: each nested zip is queued as soon as it
+    has been written, and the pdata archives are extracted alongside the GIS
+    bundle rather than after it.
 
 Security:
     Zip-Slip protection is enforced by `safe_extract` and preserved for nested
     archives.
+
+Memory:
+    Members are streamed to disk in `--buffer-kb` chunks (default 1 MiB), so
+    memory stays flat however large a member is (jur_value.txt is 1-2 GB).
+
+Incremental refresh:
+    Every extracted folder keeps a `.extract_state.json` with each member's
+    CRC-32 and size from the zip central directory; the manifest lists the
+    same per member, plus the seconds it took to extract. With `--incremental`, an
+    existing folder is neither deleted nor skipped: only members whose CRC or
+    size changed (or whose file is missing or truncated) are re-extracted, and
+    members no longer in the archive are deleted.
+
+Processes:
+    With `--processes N` members are inflated on a pool of N processes: each
+    archive's members are split into batches of similar uncompressed size and
+    every worker opens the zip itself, so one large archive (e.g.
+    Real_building_land.zip) uses all cores instead of one GIL-bound thread.
 """
 
 from __future__ import annotations
@@ -40,14 +60,29 @@ import argparse
 import fnmatch
 import json
 import logging
+import multiprocessing
 import os
 import zipfile
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    as_completed,
+    wait,
+)
 from datetime import datetime
 from pathlib import Path
-from typing import Iterable, List, Optional, Sequence
+from typing import Callable, Iterable, List, Optional, Sequence
 from tracing import trace_span, get_tracer, span_context
 import shutil
+import threading
+import time
+
+# Bytes copied per read/write when streaming a member to disk
+EXTRACT_BUFFER_SIZE = 1024 * 1024
+# Per-folder record of the extracted members' CRC-32 and size
+EXTRACT_STATE_FILE = ".extract_state.json"
+EXTRACT_STATE_VERSION = 1
 
 
 @trace_span()
@@ -68,29 +103,82 @@ def iter_zip_files(indir: str, pattern: Optional[str] = None) -> Iterable[Path]:
 
 
 @trace_span()
-def safe_extract(zipf: zipfile.ZipFile, target_dir: Path) -> None:
-    """Extract a ZipFile into target_dir while preventing Zip-Slip vulnerabilities."""
+def safe_extract(
+    zipf: zipfile.ZipFile,
+    target_dir: Path,
+    buffer_size: int = EXTRACT_BUFFER_SIZE,
+    members: Optional[Sequence[str]] = None,
+    on_member: Optional[Callable[[str], None]] = None,
+) -> List[dict]:
+    """Extract a ZipFile into target_dir while preventing Zip-Slip vulnerabilities.
+
+    Each member is streamed in buffer_size chunks rather than read whole.
+    members limits extraction to those names (default: every member), and
+    on_member is called with each file's path as soon as it is written.
+
+    Returns one record per file written: name, size and crc from the central
+    directory, and the seconds it took.
+    """
+    written: List[dict] = []
     target_dir.mkdir(parents=True, exist_ok=True)
-    for member in zipf.namelist():
-        member_path = target_dir.joinpath(member)
-        try:
-            # Resolve to check path traversal
-            abs_target = member_path.resolve()
-        except Exception:
-            # Skip paths we can't resolve
-            continue
-        if not str(abs_target).startswith(str(target_dir.resolve())):
+    # Resolved once; members are then checked by string normalization only
+    root = str(target_dir.resolve())
+    made_dirs = {root}
+    infos = zipf.infolist() if members is None else map(zipf.getinfo, members)
+    for info in infos:
+        member = info.filename
+        abs_target = _member_target(root, member)
+        if abs_target is None:
             # Unsafe path, skip
             print(f"Skipping unsafe member: {member}")
             continue
-        # Create parent dirs if needed
-        member_parent = abs_target.parent
-        member_parent.mkdir(parents=True, exist_ok=True)
         if member.endswith("/"):
             # directory entry
+            if abs_target not in made_dirs:
+                os.makedirs(abs_target, exist_ok=True)
+                made_dirs.add(abs_target)
             continue
-        with zipf.open(member) as src, open(abs_target, "wb") as dst:
-            dst.write(src.read())
+        # Create each parent dir once
+        member_parent = os.path.dirname(abs_target)
+        if member_parent not in made_dirs:
+            os.makedirs(member_parent, exist_ok=True)
+            made_dirs.add(member_parent)
+        start = time.perf_counter()
+        with zipf.open(info) as src, open(abs_target, "wb") as dst:
+            shutil.copyfileobj(src, dst, buffer_size)
+        written.append(_member_record(info, time.perf_counter() - start))
+        if on_member is not None:
+            on_member(abs_target)
+    return written
+
+
+def _member_target(root: str, member: str) -> Optional[str]:
+    """Absolute path for member under the resolved root, or None if it would
+    land outside it (`..` segments, absolute paths, drive letters) or on the
+    root itself.
+
+    Pure normalization without touching the filesystem: extraction only ever
+    creates regular files and directories, so no symlink inside root can
+    redirect a member unless one was planted there beforehand.
+    """
+    if not member or "\x00" in member:
+        return None
+    target = os.path.normpath(os.path.join(root, member))
+    if not target.startswith(root + os.sep) and not (
+        root.endswith(os.sep) and target.startswith(root) and target != root
+    ):
+        return None
+    return target
+
+
+def _member_record(info: zipfile.ZipInfo, seconds: Optional[float]) -> dict:
+    """Manifest entry for a member; seconds is None if it was not re-extracted."""
+    return {
+        "name": info.filename,
+        "size": info.file_size,
+        "crc": info.CRC,
+        "seconds": round(seconds, 4) if seconds is not None else None,
+    }
 
 
 @trace_span()
@@ -99,6 +187,9 @@ def extract_zip_file(
     outdir: Path,
     overwrite: bool = False,
     category: Optional[str] = None,
+    buffer_size: int = EXTRACT_BUFFER_SIZE,
+    incremental: bool = False,
+    on_member: Optional[Callable[[str], None]] = None,
 ) -> dict:
     """Extract a single zip file into outdir/<zip_basename>/ and return info dict.
 
@@ -107,7 +198,41 @@ def extract_zip_file(
         outdir: Base output directory (category root) under which a folder named after the zip basename will be created.
         overwrite: If True and destination exists, it will be deleted before extraction.
         category: Optional string identifying logical grouping (e.g. 'gis' or 'pdata').
+        buffer_size: Bytes per chunk when streaming members to disk.
+        incremental: Update an existing folder in place, extracting only
+            changed members and deleting removed ones (overwrite is ignored).
+        on_member: Called with the path of each file as soon as it is written.
     """
+    info, dest = _prepare_destination(
+        zip_path, outdir, overwrite, category, incremental
+    )
+    if info["skipped"]:
+        return info
+    logging.info("Extracting %s -> %s", zip_path, dest)
+    try:
+        with zipfile.ZipFile(zip_path, "r") as zf:
+            members, unchanged = _plan_members(zf, dest, incremental, info)
+            written = safe_extract(zf, dest, buffer_size, members, on_member)
+        _finish_extraction(info, dest, unchanged + written)
+    except zipfile.BadZipFile:
+        info["error"] = "BadZipFile"
+        logging.exception("Bad zip file: %s", zip_path)
+    except Exception as e:
+        info["error"] = str(e)
+        logging.exception("Error extracting %s: %s", zip_path, e)
+    return info
+
+
+def _prepare_destination(
+    zip_path: Path,
+    outdir: Path,
+    overwrite: bool,
+    category: Optional[str],
+    incremental: bool = False,
+) -> tuple[dict, Path]:
+    """Info dict and destination folder for zip_path, clearing an existing
+    folder on overwrite or marking the archive skipped otherwise (an
+    incremental extraction keeps the folder as it is)."""
     base = zip_path.stem
     dest = outdir.joinpath(base)
     info = {
@@ -116,10 +241,13 @@ def extract_zip_file(
         "skipped": False,
         "extracted_files": 0,
         "total_bytes": 0,
+        "changed_members": 0,
+        "removed_members": 0,
+        "members": [],
         "error": None,
         "category": category,
     }
-    if dest.exists():
+    if dest.exists() and not incremental:
         if overwrite:
             try:
                 shutil.rmtree(dest)
@@ -129,30 +257,160 @@ def extract_zip_file(
         else:
             logging.info("Skipping existing extraction: %s", dest)
             info["skipped"] = True
-            return info
-    logging.info("Extracting %s -> %s", zip_path, dest)
+    return info, dest
+
+
+def _read_state(dest: Path) -> dict:
+    """{member: [crc, size]} recorded by the last extraction into dest."""
     try:
-        with zipfile.ZipFile(zip_path, "r") as zf:
-            safe_extract(zf, dest)
-        # compute totals
-        total_files = 0
-        total_bytes = 0
-        for root, _, files in os.walk(dest):
-            for fn in files:
-                total_files += 1
-                try:
-                    total_bytes += os.path.getsize(os.path.join(root, fn))
-                except Exception:
-                    pass
-        info["extracted_files"] = total_files
-        info["total_bytes"] = total_bytes
-    except zipfile.BadZipFile:
-        info["error"] = "BadZipFile"
-        logging.exception("Bad zip file: %s", zip_path)
-    except Exception as e:
-        info["error"] = str(e)
-        logging.exception("Error extracting %s: %s", zip_path, e)
-    return info
+        state = json.loads(dest.joinpath(EXTRACT_STATE_FILE).read_text("utf-8"))
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(state, dict) or state.get("version") != EXTRACT_STATE_VERSION:
+        return {}
+    return state.get("members", {})
+
+
+def _write_state(dest: Path, state: dict) -> None:
+    tmp = dest.joinpath(EXTRACT_STATE_FILE + ".tmp")
+    tmp.write_text(json.dumps(state, indent=1), encoding="utf-8")
+    os.replace(tmp, dest.joinpath(EXTRACT_STATE_FILE))
+
+
+def _plan_members(
+    zf: zipfile.ZipFile, dest: Path, incremental: bool, info: dict
+) -> tuple[Optional[List[str]], List[dict]]:
+    """Members to extract into dest (None: all of them) and the manifest
+    records of those left as they are. An incremental plan deletes members
+    that left the archive and keeps those whose CRC-32 and size match the
+    last extraction and whose file is still complete on disk. Members that
+    would land outside dest are never extracted, so they never count as
+    changed."""
+    dest_root = str(dest.resolve())
+    infos = [
+        i for i in zf.infolist() if _member_target(dest_root, i.filename) is not None
+    ]
+    current = {i.filename: [i.CRC, i.file_size] for i in infos if not i.is_dir()}
+    if not incremental:
+        info["changed_members"] = len(current)
+        return None, []
+    previous = _read_state(dest)
+    for name in previous.keys() - current.keys():
+        target = _member_target(dest_root, name)
+        if target is not None:
+            Path(target).unlink(missing_ok=True)
+            info["removed_members"] += 1
+    members = []
+    unchanged = []
+    for zinfo in infos:
+        name = zinfo.filename
+        if not zinfo.is_dir():
+            target = Path(_member_target(dest_root, name))
+            if previous.get(name) == current[name] and (
+                target.is_file() and target.stat().st_size == zinfo.file_size
+            ):
+                unchanged.append(_member_record(zinfo, None))
+                continue
+            info["changed_members"] += 1
+        members.append(name)
+    return members, unchanged
+
+
+def _finish_extraction(info: dict, dest: Path, records: List[dict]) -> None:
+    """Fill the manifest totals from the central directory records of the
+    members now in dest (no directory walk) and save them as dest's state."""
+    records.sort(key=lambda r: r["name"])
+    info["members"] = records
+    info["extracted_files"] = len(records)
+    info["total_bytes"] = sum(r["size"] for r in records)
+    _write_state(
+        dest,
+        {
+            "version": EXTRACT_STATE_VERSION,
+            "members": {r["name"]: [r["crc"], r["size"]] for r in records},
+        },
+    )
+
+
+def _member_batches(infos: Sequence[zipfile.ZipInfo], parts: int) -> List[List[str]]:
+    """Split member names into at most parts batches of similar uncompressed
+    size: largest first, each into the currently lightest batch."""
+    batches: List[List[str]] = [[] for _ in range(min(parts, len(infos)))]
+    loads = [0] * len(batches)
+    for zinfo in sorted(infos, key=lambda i: i.file_size, reverse=True):
+        lightest = loads.index(min(loads))
+        batches[lightest].append(zinfo.filename)
+        loads[lightest] += zinfo.file_size
+    return batches
+
+
+def _extract_members(
+    zip_path: str, dest: str, members: List[str], buffer_size: int
+) -> List[dict]:
+    """Process-pool worker: open the archive independently and extract members."""
+    with zipfile.ZipFile(zip_path, "r") as zf:
+        return safe_extract(zf, Path(dest), buffer_size, members)
+
+
+def _extract_zip_list_processes(
+    zip_paths: Sequence[Path],
+    outdir_p: Path,
+    overwrite: bool,
+    processes: int,
+    category: Optional[str],
+    buffer_size: int,
+    incremental: bool = False,
+) -> List[dict]:
+    """Extract zip_paths with their members spread over a process pool."""
+    results: List[dict] = []
+    pending: dict = {}  # zip path -> [info, dest, batches left, member records]
+    # Spawned workers: callers may be running extraction from threads
+    spawn = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=processes, mp_context=spawn) as ex:
+        futures = {}
+        for z in zip_paths:
+            info, dest = _prepare_destination(
+                z, outdir_p, overwrite, category, incremental
+            )
+            if info["skipped"]:
+                results.append(info)
+                continue
+            logging.info("Extracting %s -> %s (%d processes)", z, dest, processes)
+            dest.mkdir(parents=True, exist_ok=True)
+            try:
+                with zipfile.ZipFile(z, "r") as zf:
+                    members, unchanged = _plan_members(zf, dest, incremental, info)
+                    infos = zf.infolist()
+                    if members is not None:
+                        infos = [zf.getinfo(name) for name in members]
+                    batches = _member_batches(infos, processes)
+            except zipfile.BadZipFile:
+                info["error"] = "BadZipFile"
+                logging.exception("Bad zip file: %s", z)
+                results.append(info)
+                continue
+            if not batches:
+                _finish_extraction(info, dest, unchanged)
+                results.append(info)
+                continue
+            pending[z] = [info, dest, len(batches), unchanged]
+            for batch in batches:
+                fut = ex.submit(_extract_members, str(z), str(dest), batch, buffer_size)
+                futures[fut] = z
+        for fut in as_completed(futures):
+            z = futures[fut]
+            info, dest, _left, records = pending[z]
+            try:
+                records.extend(fut.result())
+            except Exception as e:
+                info["error"] = info["error"] or str(e)
+                logging.exception("Error extracting %s: %s", z, e)
+            pending[z][2] -= 1
+            if not pending[z][2]:
+                if not info["error"]:
+                    _finish_extraction(info, dest, records)
+                results.append(info)
+    return results
 
 
 @trace_span("_extract_zip_list")
@@ -162,18 +420,40 @@ def _extract_zip_list(
     overwrite: bool,
     workers: int,
     category: Optional[str] = None,
+    buffer_size: int = EXTRACT_BUFFER_SIZE,
+    processes: int = 0,
+    incremental: bool = False,
 ) -> List[dict]:
     """Internal helper to extract a sequence of zip Paths with optional threading.
 
     Each zip is extracted under outdir_p/<zip_basename>. Category passed through for manifest metadata.
+    With processes > 1, members are extracted on a process pool instead.
     """
     results: List[dict] = []
     if not zip_paths:
         return results
+    if processes and processes > 1:
+        return _extract_zip_list_processes(
+            zip_paths,
+            outdir_p,
+            overwrite,
+            processes,
+            category,
+            buffer_size,
+            incremental,
+        )
     if workers and workers > 1:
         with ThreadPoolExecutor(max_workers=workers) as ex:
             futures = {
-                ex.submit(extract_zip_file, z, outdir_p, overwrite, category): z
+                ex.submit(
+                    extract_zip_file,
+                    z,
+                    outdir_p,
+                    overwrite,
+                    category,
+                    buffer_size,
+                    incremental,
+                ): z
                 for z in zip_paths
             }
             for fut in as_completed(futures):
@@ -188,11 +468,164 @@ def _extract_zip_list(
                     )
     else:
         for z in zip_paths:
-            info = extract_zip_file(z, outdir_p, overwrite=overwrite, category=category)
+            info = extract_zip_file(
+                z,
+                outdir_p,
+                overwrite=overwrite,
+                category=category,
+                buffer_size=buffer_size,
+                incremental=incremental,
+            )
             results.append(info)
     return results
 
 
+def _nested_zips(info: dict) -> List[Path]:
+    """Zip files inside an extracted GIS bundle folder."""
+    dest = Path(info["destination"])
+    if info.get("skipped"):
+        return [p for p in dest.rglob("*.zip") if p.is_file()]
+    return [
+        dest.joinpath(m["name"])
+        for m in info.get("members", [])
+        if m["name"].lower().endswith(".zip")
+    ]
+
+
+@trace_span("_extract_queue")
+def _extract_queue(
+    bundles: Sequence[tuple[Path, Path, str]],
+    gis_root: Path,
+    overwrite: bool,
+    workers: int,
+    buffer_size: int = EXTRACT_BUFFER_SIZE,
+    incremental: bool = False,
+    archives: Sequence[tuple[Path, Path, str]] = (),
+) -> List[dict]:
+    """Extract (zip, outdir, category) jobs on one shared thread pool.
+
+    Zips written while extracting a bundle (GIS_Public.zip) are queued for
+    extraction into gis_root the moment they land, so nested archives and
+    the plain archives run concurrently with the rest of the bundle. Nested
+    zips the bundle did not rewrite (unchanged in an incremental refresh, or
+    in a folder skipped as already extracted) are queued when it finishes.
+    """
+    results: List[dict] = []
+    futures: dict = {}
+    queued: set = set()
+    lock = threading.Lock()
+
+    def _on_bundle_member(path: str) -> None:
+        if path.lower().endswith(".zip"):
+            _submit(Path(path), gis_root, "gis")
+
+    with ThreadPoolExecutor(max_workers=max(1, workers or 1)) as ex:
+
+        def _submit(
+            zip_path: Path, outdir: Path, category: str, bundle: bool = False
+        ) -> None:
+            key = zip_path.resolve()
+            with lock:
+                if key in queued:
+                    return
+                queued.add(key)
+                fut = ex.submit(
+                    extract_zip_file,
+                    zip_path,
+                    outdir,
+                    overwrite,
+                    category,
+                    buffer_size,
+                    incremental,
+                    _on_bundle_member if bundle else None,
+                )
+                futures[fut] = (zip_path, bundle)
+
+        for zip_path, outdir, category in bundles:
+            _submit(zip_path, outdir, category, bundle=True)
+        for zip_path, outdir, category in archives:
+            _submit(zip_path, outdir, category)
+        # Jobs only enqueue work before they finish, so an empty set is final
+        while True:
+            with lock:
+                pending = list(futures)
+            if not pending:
+                break
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for fut in done:
+                with lock:
+                    z, bundle = futures.pop(fut)
+                try:
+                    info = fut.result()
+                except Exception as e:  # pragma: no cover (defensive)
+                    logging.exception("Error extracting %s: %s", z, e)
+                    results.append(
+                        {"zip": str(z), "destination": None, "error": str(e)}
+                    )
+                    continue
+                results.append(info)
+                if bundle and not info.get("error"):
+                    for nested in _nested_zips(info):
+                        _submit(nested, gis_root, "gis")
+    return results
+
+
+@trace_span()
+def extract_gis_bundle(
+    zip_path: Path,
+    gis_root: Path,
+    overwrite: bool = False,
+    workers: int = 1,
+    buffer_size: int = EXTRACT_BUFFER_SIZE,
+    processes: int = 0,
+    incremental: bool = False,
+) -> List[dict]:
+    """Extract GIS_Public.zip into gis_root, and every zip nested inside it
+    into gis_root as peer folders (queued as soon as each is written)."""
+    if not processes or processes <= 1:
+        return _extract_queue(
+            [(zip_path, gis_root, "gis")],
+            gis_root,
+            overwrite,
+            workers,
+            buffer_size,
+            incremental,
+        )
+    results = _extract_zip_list(
+        [zip_path],
+        gis_root,
+        overwrite,
+        workers,
+        "gis",
+        buffer_size,
+        processes,
+        incremental,
+    )
+    gis_public_dir = gis_root.joinpath(zip_path.stem)
+    if not gis_public_dir.exists():
+        logging.warning("Expected GIS_Public directory not found at %s", gis_public_dir)
+        return results
+    nested_zips = [p for p in gis_public_dir.rglob("*.zip") if p.is_file()]
+    if nested_zips:
+        logging.info(
+            "Found %d nested GIS zip(s); extracting into gis_data root.",
+            len(nested_zips),
+        )
+        results.extend(
+            _extract_zip_list(
+                nested_zips,
+                gis_root,
+                overwrite,
+                workers,
+                "gis",
+                buffer_size,
+                processes,
+                incremental,
+            )
+        )
+    return results
+
+
 @trace_span()
 def extract_all(
     indir: str = "downloads",
@@ -201,6 +634,9 @@ def extract_all(
     pattern: Optional[str] = None,
     workers: int = 1,
     manifest: Optional[str] = None,
+    buffer_size: int = EXTRACT_BUFFER_SIZE,
+    processes: int = 0,
+    incremental: bool = False,
 ) -> List[dict]:
     indir_p = Path(indir)
     outdir_p = Path(outdir)
@@ -208,8 +644,8 @@ def extract_all(
     # Structured category roots
     pdata_root = outdir_p.joinpath("pdata")
     gis_root = outdir_p.joinpath("gis_data")
-    # Clean if overwrite requested
-    if overwrite:
+    # Clean if overwrite requested (an incremental refresh updates in place)
+    if overwrite and not incremental:
         for p in (pdata_root, gis_root):
             if p.exists():
                 try:
@@ -226,43 +662,64 @@ def extract_all(
         logging.info("No zip files found in %s", indir)
         return results
 
-    # 1. Prioritize GIS_Public.zip if present.
     gis_public_candidates = [z for z in zip_files if z.name.lower() == "gis_public.zip"]
-    processed: List[Path] = []
-    if gis_public_candidates:
-        logging.info("GIS_Public.zip detected; extracting GIS bundle first.")
+    if not processes or processes <= 1:
+        # GIS bundle, its nested zips and the pdata archives on one queue
+        if gis_public_candidates:
+            logging.info("GIS_Public.zip detected; extracting GIS bundle.")
+        gis_resolved = gis_root.resolve()
+        remaining = [
+            z
+            for z in zip_files
+            if z not in gis_public_candidates
+            # Nested GIS zips from an earlier run (outdir inside indir)
+            and gis_resolved not in z.resolve().parents
+        ]
         results.extend(
-            _extract_zip_list(
-                gis_public_candidates, gis_root, overwrite, workers, category="gis"
+            _extract_queue(
+                [(z, gis_root, "gis") for z in gis_public_candidates],
+                gis_root,
+                overwrite,
+                workers,
+                buffer_size,
+                incremental,
+                archives=[(z, pdata_root, "pdata") for z in remaining],
             )
         )
-        processed.extend(gis_public_candidates)
-        # Nested zips under gis_root/GIS_Public
-        gis_public_dir = gis_root.joinpath("GIS_Public")
-        if gis_public_dir.exists():
-            nested_zips = [p for p in gis_public_dir.rglob("*.zip") if p.is_file()]
-            if nested_zips:
-                logging.info(
-                    "Found %d nested GIS zip(s); extracting into gis_data root.",
-                    len(nested_zips),
-                )
-                results.extend(
-                    _extract_zip_list(
-                        nested_zips, gis_root, overwrite, workers, category="gis"
-                    )
-                )
-                processed.extend(nested_zips)
-        else:
-            logging.warning(
-                "Expected GIS_Public directory not found at %s", gis_public_dir
+    # A process pool already spreads each archive's members over every core,
+    # so archives go through it one after another:
+    # 1. Prioritize GIS_Public.zip if present.
+    processed: List[Path] = []
+    if processes and processes > 1 and gis_public_candidates:
+        logging.info("GIS_Public.zip detected; extracting GIS bundle first.")
+        for gis_zip in gis_public_candidates:
+            gis_results = extract_gis_bundle(
+                gis_zip,
+                gis_root,
+                overwrite,
+                workers,
+                buffer_size,
+                processes,
+                incremental,
             )
+            results.extend(gis_results)
+            # Nested zips were extracted as part of the bundle
+            processed.extend(Path(r["zip"]) for r in gis_results)
+        processed.extend(gis_public_candidates)
 
     # 2. Extract remaining (non GIS_Public) top-level zips.
     remaining = [z for z in zip_files if z not in processed]
-    if remaining:
+    if processes and processes > 1 and remaining:
         results.extend(
             _extract_zip_list(
-                remaining, pdata_root, overwrite, workers, category="pdata"
+                remaining,
+                pdata_root,
+                overwrite,
+                workers,
+                "pdata",
+                buffer_size,
+                processes,
+                incremental,
             )
         )
 
@@ -325,6 +782,23 @@ def main() -> None:
         default=None,
         help="Path to manifest file or directory to write manifest JSON",
     )
+    parser.add_argument(
+        "--buffer-kb",
+        type=int,
+        default=EXTRACT_BUFFER_SIZE // 1024,
+        help="KiB copied per chunk when streaming members to disk",
+    )
+    parser.add_argument(
+        "--processes",
+        type=int,
+        default=0,
+        help="Extract members on N processes, splitting large archives across them",
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Re-extract only members whose CRC/size changed and delete removed ones",
+    )
     # Removed --gis-outdir (legacy behavior now replaced by structured layout)
     args = parser.parse_args()
 
@@ -335,6 +809,9 @@ def main() -> None:
         pattern=args.pattern,
         workers=args.workers,
         manifest=args.manifest,
+        buffer_size=args.buffer_kb * 1024,
+        processes=args.processes,
+        incremental=args.incremental,
     )
     print(f"Processed {len(results)} archive(s) into '{args.outdir}'")
 
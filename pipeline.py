@@ -0,0 +1,304 @@
+"""Overlapped download -> extract -> load pipeline.
+
+Running download_year, extract_all and load.py one after another leaves the
+database idle during downloads and the network idle during loads. run_pipeline
+overlaps the three stages instead:
+
+ - downloads run on a thread pool (download_workers at a time);
+ - each archive is extracted as soon as it lands (extract_workers at a time),
+   or with from_zips its `.txt` members are read in place (see load.py);
+ - each table found in an archive is queued for loading and starts, on a
+   process pool of load_workers, once every FK parent that is part of the
+   run has finished loading. A parent whose archive never shows up stops
+   blocking its children once all archives are in.
+
+End-to-end time then approaches the slowest stage rather than the sum of all
+three. Tables are dropped and recreated up front as in a full `load.py` run,
+every table is journaled so `load.py --resume` can finish an interrupted run,
+and post_load_setup.sql runs at the end.
+
+Usage:
+    python main.py --year 2025 --outdir downloads/2025 --pipeline --db-uri ...
+"""
+
+from __future__ import annotations
+
+import multiprocessing
+import os
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    wait,
+)
+from dataclasses import replace
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from sqlalchemy import MetaData
+
+import download
+import extract
+import load
+import schema_config
+from tracing import trace_span
+
+
+def _log(msg: str) -> None:
+    print(f"[pipeline] {msg}")
+
+
+def _extract_archive(
+    zip_path: Path,
+    extracted_outdir: Path,
+    incremental: bool = False,
+    processes: int = 0,
+) -> Dict[str, Path]:
+    """Extract one downloaded archive into the structured tree (GIS bundle
+    into gis_data/, everything else into pdata/) and return its data files."""
+    if zip_path.name.lower() == "gis_public.zip":
+        results = extract.extract_gis_bundle(
+            zip_path,
+            extracted_outdir / "gis_data",
+            overwrite=True,
+            processes=processes,
+            incremental=incremental,
+        )
+    else:
+        results = extract._extract_zip_list(
+            [zip_path],
+            extracted_outdir / "pdata",
+            overwrite=True,
+            workers=1,
+            category="pdata",
+            processes=processes,
+            incremental=incremental,
+        )
+    data_files: Dict[str, Path] = {}
+    for info in results:
+        if info.get("error"):
+            raise RuntimeError(f"extracting {info['zip']}: {info['error']}")
+        data_files.update(load.find_data_files(Path(info["destination"])))
+    return data_files
+
+
+@trace_span()
+def run_pipeline(
+    year: int,
+    outdir: str = "downloads",
+    extracted_outdir: str = "extracted",
+    db_uri: str | None = None,
+    download_workers: int = 4,
+    extract_workers: int = 2,
+    load_workers: int = 2,
+    urls: Optional[List[str]] = None,
+    codebook_dir: str | Path = load.CODEBOOK_DIR_DEFAULT,
+    load_engine: str | None = None,
+    chunk_mb: int | None = None,
+    rejects_dir: str | Path | None = load.REJECTS_DIR_DEFAULT,
+    from_zips: bool = False,
+    segments: int = 1,
+    incremental: bool = False,
+    extract_processes: int = 0,
+) -> Dict[str, int]:
+    """Download, extract and load a year's archives with the stages overlapped.
+
+    Args:
+            year: Year whose CAMA files are downloaded (see `download.download_year`).
+            outdir: Directory to save downloads.
+            extracted_outdir: Root of the structured extraction (pdata/, gis_data/).
+            db_uri: Database URI; None reads DATABASE_URL from the environment/.env.
+            download_workers: Concurrent downloads.
+            extract_workers: Concurrent archive extractions.
+            load_workers: Concurrent table (or chunk) loads, in worker processes.
+            urls: Archive URLs to fetch instead of the default list for year.
+            codebook_dir: Directory containing *_columns.csv codebook files.
+            load_engine: One of `load.LOAD_ENGINES`; defaults as in `load.load_data`.
+            chunk_mb: Split extracted files above this many MB into chunks
+                    loaded by separate workers (needs load_workers > 1).
+            rejects_dir: Where values failing numeric/int/date conversion go.
+            from_zips: Load the `.txt` members straight from the downloaded
+                    archives; nothing is extracted.
+            segments: Concurrent byte ranges per large download (see
+                    `download.download_file`).
+            incremental: Refresh extracted folders in place, re-extracting only
+                    changed members (see `extract.extract_zip_file`).
+            extract_processes: Extract each archive's members on this many
+                    processes (see `extract.extract_all`).
+
+    Returns:
+            Rows loaded per table.
+    """
+    if urls is None:
+        urls = download.build_urls_for_year(year, download.DEFAULT_FILENAMES)
+        urls.extend(download.DEFAULT_ADDITIONAL_URLS)
+    db_uri = load._resolve_db_uri(db_uri)
+    engine = load._create_engine(db_uri)
+    postgres = engine.dialect.name == "postgresql"
+    if load_engine is None:
+        load_engine = "copy" if postgres else "insert"
+    if load_engine not in load.LOAD_ENGINES:
+        raise ValueError(
+            f"Unknown load engine {load_engine!r}; use one of {load.LOAD_ENGINES}"
+        )
+    if load_engine == "copy" and not postgres:
+        raise ValueError("The copy load engine requires a PostgreSQL database URI.")
+
+    table_defs = load.discover_codebook_tables(Path(codebook_dir))
+    if not table_defs:
+        raise RuntimeError(f"No codebook tables discovered under {codebook_dir}")
+    metadata = MetaData()
+    for name, cols in table_defs.items():
+        load.build_table(metadata, name, cols)
+    _log("Dropping and recreating tables...")
+    metadata.drop_all(engine)
+    metadata.create_all(engine)
+    if postgres:
+        load._ensure_journal(engine)
+        with engine.begin() as conn:
+            conn.exec_driver_sql(
+                f"DELETE FROM {load.JOURNAL_TABLE} WHERE schema_name = current_schema()"
+            )
+            load._clear_row_digests(conn, table_defs)
+
+    parents = {
+        name: {
+            ref
+            for _local, ref, _ref_cols in schema_config.get_foreign_keys(name)
+            if ref in table_defs and ref != name
+        }
+        for name in table_defs
+    }
+    chunk_bytes = chunk_mb * 1024 * 1024 if chunk_mb and load_workers > 1 else None
+    settings = load.LoadSettings(
+        db_uri=db_uri,
+        codebook_dir=str(codebook_dir),
+        load_engine=load_engine,
+        rejects_dir=str(rejects_dir) if rejects_dir is not None else None,
+        journal=postgres,
+    )
+
+    sources: Dict[str, load.DataSource] = {}
+    waiting: set[str] = set()
+    finished: set[str] = set()
+    failed: set[str] = set()
+    chunks_left: Dict[str, int] = {}
+    rows_loaded: Dict[str, int] = {}
+    archives_left = len(urls)
+    futures: Dict[Future, tuple[str, object]] = {}
+
+    def _add_sources(found: Dict[str, load.DataSource]) -> None:
+        for name, source in found.items():
+            if name not in table_defs:
+                continue
+            if name in sources:
+                _log(
+                    f"Warning: {name} found again in {source}; keeping {sources[name]}"
+                )
+                continue
+            sources[name] = source
+            waiting.add(name)
+
+    def _ready(name: str) -> bool:
+        # A parent blocks until it has loaded, or until all archives are in
+        # without it (as in load.py, children of absent parents still load)
+        return all(
+            parent in finished or (not archives_left and parent not in sources)
+            for parent in parents[name]
+        )
+
+    def _submit_load(name: str) -> None:
+        waiting.discard(name)
+        source = sources[name]
+        fingerprint = load._file_fingerprint(source, []) if postgres else ""
+        ranges = load._split_load_ranges(name, source, chunk_bytes, fingerprint)
+        if postgres:
+            load._journal_pending(engine, ranges)
+        suffix = f" in {len(ranges)} chunks" if len(ranges) > 1 else ""
+        _log(f"Loading {name} from {source}{suffix} ...")
+        task = replace(settings, parent_tables=frozenset(finished - failed))
+        chunks_left[name] = len(ranges)
+        rows_loaded[name] = 0
+        for rng in ranges:
+            fut = load_pool.submit(load._load_table_worker, task, name, source, rng)
+            futures[fut] = ("load", name)
+
+    os.makedirs(outdir, exist_ok=True)
+    extracted_root = Path(extracted_outdir)
+    # Spawned workers: forking next to the download/extract threads is unsafe
+    spawn = multiprocessing.get_context("spawn")
+    with (
+        download._session(max(10, download_workers * segments)) as session,
+        ThreadPoolExecutor(max_workers=download_workers) as download_pool,
+        ThreadPoolExecutor(max_workers=extract_workers) as extract_pool,
+        ProcessPoolExecutor(max_workers=load_workers, mp_context=spawn) as load_pool,
+    ):
+        for url in urls:
+            fut = download_pool.submit(
+                download.download_file, url, outdir, session, segments=segments
+            )
+            futures[fut] = ("download", url)
+
+        while futures:
+            done, _ = wait(futures, return_when=FIRST_COMPLETED)
+            for fut in done:
+                stage, item = futures.pop(fut)
+                if stage == "download":
+                    try:
+                        zip_path = Path(fut.result())
+                    except Exception as e:
+                        archives_left -= 1
+                        _log(f"Error downloading {item}: {e}")
+                        continue
+                    _log(f"Downloaded {zip_path.name}")
+                    if from_zips:
+                        archives_left -= 1
+                        _add_sources(load.zip_members(zip_path))
+                    else:
+                        fut = extract_pool.submit(
+                            _extract_archive,
+                            zip_path,
+                            extracted_root,
+                            incremental,
+                            extract_processes,
+                        )
+                        futures[fut] = ("extract", zip_path)
+                elif stage == "extract":
+                    archives_left -= 1
+                    try:
+                        _add_sources(fut.result())
+                        _log(f"Extracted {item.name}")
+                    except Exception as e:
+                        _log(f"Error extracting {item}: {e}")
+                else:
+                    try:
+                        rows_loaded[item] += fut.result()
+                    except Exception as e:
+                        failed.add(item)
+                        _log(f"Error loading {item}: {e}")
+                    chunks_left[item] -= 1
+                    if chunks_left[item]:
+                        continue
+                    if item not in failed:
+                        _log(f"Loaded {rows_loaded[item]} rows into {item}.")
+                    finished.add(item)
+
+            for name in load._topological_sort_tables(sorted(waiting)):
+                if _ready(name):
+                    _submit_load(name)
+            if not futures and waiting:
+                # Only an FK cycle can leave tables waiting with nothing running
+                _log(f"Loading unresolved FK cycle: {', '.join(sorted(waiting))}")
+                for name in sorted(waiting):
+                    _submit_load(name)
+
+    _log("Executing post-load setup (creating functions and views)...")
+    try:
+        load._execute_post_load_setup(engine)
+        _log("Post-load setup completed successfully.")
+    except Exception as e:
+        _log(f"Warning: Post-load setup failed: {e}")
+        _log("You can manually run post_load_setup.sql to create views.")
+    engine.dispose()
+    return {name: rows_loaded[name] for name in sorted(rows_loaded)}
@@ -13,6 +13,26 @@ CREATE OR REPLACE FUNCTION safe_num(v text) RETURNS numeric AS $$
     END;
 $$ LANGUAGE SQL IMMUTABLE;
 
+-- Columns typed numeric by the loader (schema_config "column_types") pass
+-- straight through, so views skip the per-row regex
+CREATE OR REPLACE FUNCTION safe_num(v numeric) RETURNS numeric AS $$
+    SELECT v;
+$$ LANGUAGE SQL IMMUTABLE;
+
+-- =============================================
+-- HELPER FUNCTION: safe_date
+-- Parses MM/DD/YYYY text dates (NULL if blank or malformed); date columns pass through
+-- =============================================
+CREATE OR REPLACE FUNCTION safe_date(v text) RETURNS date AS $$
+    SELECT CASE
+        WHEN v ~ '^\s*\d{1,2}/\d{1,2}/\d{4}\s*$' THEN to_date(TRIM(v), 'MM/DD/YYYY')
+    END;
+$$ LANGUAGE SQL STABLE;
+
+CREATE OR REPLACE FUNCTION safe_date(v date) RETURNS date AS $$
+    SELECT v;
+$$ LANGUAGE SQL IMMUTABLE;
+
 -- =============================================
 -- PROPERTY FEATURES VIEW - normalize and aggregate features for analysis
 -- =============================================
@@ -68,16 +88,12 @@ SELECT
     COALESCE((
         SELECT COUNT(*) FROM permits p
         WHERE p.acct = ra.acct
-          AND p.issue_date IS NOT NULL
-          AND p.issue_date <> ''
-          AND to_date(p.issue_date, 'MM/DD/YYYY') >= (CURRENT_DATE - INTERVAL '5 years')
+          AND safe_date(p.issue_date) >= (CURRENT_DATE - INTERVAL '5 years')
     ), 0) AS permits_last_5yr,
     COALESCE((
         SELECT COUNT(*) FROM deeds d
         WHERE d.acct = ra.acct
-          AND d.dos IS NOT NULL
-          AND d.dos <> ''
-          AND to_date(d.dos, 'MM/DD/YYYY') >= (CURRENT_DATE - INTERVAL '5 years')
+          AND safe_date(d.dos) >= (CURRENT_DATE - INTERVAL '5 years')
     ), 0) AS sales_last_5yr,
     COALESCE((
         SELECT SUM(COALESCE(safe_num(jv.appraised_val), 0))
@@ -177,12 +193,10 @@ recent_sales AS (
     SELECT 
         d.acct,
         COUNT(*) AS sale_count,
-        MAX(to_date(NULLIF(d.dos, ''), 'MM/DD/YYYY')) AS last_sale_date,
+        MAX(safe_date(d.dos)) AS last_sale_date,
         NULL::numeric AS last_sale_price
     FROM deeds d
-    WHERE d.dos IS NOT NULL 
-        AND d.dos <> ''
-        AND to_date(NULLIF(d.dos, ''), 'MM/DD/YYYY') >= CURRENT_DATE - INTERVAL '5 years'
+    WHERE safe_date(d.dos) >= CURRENT_DATE - INTERVAL '5 years'
     GROUP BY d.acct
 ),
 exemption_summary AS (
@@ -195,7 +209,7 @@ exemption_summary AS (
         BOOL_OR(je.exempt_cat LIKE 'OA%') AS has_over_65,
         BOOL_OR(je.exempt_cat LIKE 'DV%') AS has_disabled_veteran
     FROM jur_exempt je
-    WHERE je.exempt_val IS NOT NULL AND je.exempt_val <> ''
+    WHERE je.exempt_val IS NOT NULL
     GROUP BY je.acct
 )
 SELECT 
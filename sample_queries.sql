@@ -33,6 +33,11 @@ CREATE OR REPLACE FUNCTION safe_num(v text) RETURNS numeric AS $$
     END;
 $$ LANGUAGE SQL IMMUTABLE;
 
+-- Value columns the loader stores as numeric pass straight through
+CREATE OR REPLACE FUNCTION safe_num(v numeric) RETURNS numeric AS $$
+    SELECT v;
+$$ LANGUAGE SQL IMMUTABLE;
+
 -- 1) Properties with missing numeric market value after sanitization
 SELECT
         ra.acct,
@@ -42,7 +47,6 @@ SELECT
 FROM real_acct ra
 LEFT JOIN property_features pf ON ra.acct = pf.acct
 WHERE ra.tot_mkt_val IS NOT NULL
-    AND ra.tot_mkt_val <> ''
     AND pf.tot_mkt_val_num IS NULL
 LIMIT 50;
 
@@ -300,9 +304,9 @@ FROM deeds d
 JOIN real_acct ra ON d.acct = ra.acct
 LEFT JOIN building_res br ON d.acct = br.acct AND br.bld_num = '1'
 WHERE ra.Neighborhood_Code = '1234.50'
-    AND to_date(NULLIF(d.dos, ''), 'MM/DD/YYYY') >= CURRENT_DATE - INTERVAL '1 year'
+    AND d.dos >= CURRENT_DATE - INTERVAL '1 year'
   AND d.sale_price > 0
-ORDER BY to_date(NULLIF(d.dos, ''), 'MM/DD/YYYY') DESC;
+ORDER BY d.dos DESC;
 
 -- =============================================
 -- 8. PROTEST AND HEARING ANALYSIS
@@ -356,8 +360,8 @@ FROM permits p
 JOIN real_acct ra ON p.acct = ra.acct
 LEFT JOIN desc_r_19_permit_code pc ON p.permit_type = pc."Code"
 LEFT JOIN desc_r_18_permit_status ps ON p.status = ps.permit_status_cd
-WHERE to_date(NULLIF(p.issue_date, ''), 'MM/DD/YYYY') >= CURRENT_DATE - INTERVAL '2 years'
-ORDER BY to_date(NULLIF(p.issue_date, ''), 'MM/DD/YYYY') DESC
+WHERE p.issue_date >= CURRENT_DATE - INTERVAL '2 years'
+ORDER BY p.issue_date DESC
 LIMIT 100;
 
 -- =============================================
@@ -473,7 +477,7 @@ WHERE ra.site_addr_3 = '77040'
             ra.site_addr_1 ILIKE '%WALL ST%'
             OR UPPER(ra.str) = 'WALL'
     )
-ORDER BY COALESCE(NULLIF(d.dos, ''), '01/01/1900')::date DESC
+ORDER BY d.dos DESC NULLS LAST
 LIMIT 100;
 
 -- =============================================
@@ -541,17 +545,13 @@ SELECT
     COALESCE((
         SELECT COUNT(*) FROM permits p
         WHERE p.acct = ra.acct
-          AND p.issue_date IS NOT NULL
-          AND p.issue_date <> ''
-          AND to_date(p.issue_date, 'MM/DD/YYYY') >= (CURRENT_DATE - INTERVAL '5 years')
+          AND p.issue_date >= (CURRENT_DATE - INTERVAL '5 years')
     ), 0) AS permits_last_5yr,
     -- Sales in last 5 years
     COALESCE((
         SELECT COUNT(*) FROM deeds d
         WHERE d.acct = ra.acct
-          AND d.dos IS NOT NULL
-          AND d.dos <> ''
-          AND to_date(d.dos, 'MM/DD/YYYY') >= (CURRENT_DATE - INTERVAL '5 years')
+          AND d.dos >= (CURRENT_DATE - INTERVAL '5 years')
     ), 0) AS sales_last_5yr,
     -- Jurisdiction tax aggregate (sum appraised val across jurisdictions)
     COALESCE((
@@ -710,14 +710,12 @@ recent_sales AS (
     SELECT 
         d.acct,
         COUNT(*) AS sale_count,
-        MAX(to_date(NULLIF(d.dos, ''), 'MM/DD/YYYY')) AS last_sale_date,
-        MAX(CASE WHEN to_date(NULLIF(d.dos, ''), 'MM/DD/YYYY') = 
-            (SELECT MAX(to_date(NULLIF(d2.dos, ''), 'MM/DD/YYYY')) FROM deeds d2 WHERE d2.acct = d.acct)
+        MAX(d.dos) AS last_sale_date,
+        MAX(CASE WHEN d.dos = 
+            (SELECT MAX(d2.dos) FROM deeds d2 WHERE d2.acct = d.acct)
             THEN safe_num(d.sale_price) END) AS last_sale_price
     FROM deeds d
-    WHERE d.dos IS NOT NULL 
-        AND d.dos <> ''
-        AND to_date(NULLIF(d.dos, ''), 'MM/DD/YYYY') >= CURRENT_DATE - INTERVAL '5 years'
+    WHERE d.dos >= CURRENT_DATE - INTERVAL '5 years'
     GROUP BY d.acct
 ),
 -- Exemptions summary
@@ -731,7 +729,7 @@ exemption_summary AS (
         BOOL_OR(je.exempt_cd LIKE 'OA%') AS has_over_65,
         BOOL_OR(je.exempt_cd LIKE 'DV%') AS has_disabled_veteran
     FROM jur_exempt je
-    WHERE je.exempt_val IS NOT NULL AND je.exempt_val <> ''
+    WHERE je.exempt_val IS NOT NULL
     GROUP BY je.acct
 )
 
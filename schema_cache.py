@@ -0,0 +1,96 @@
+"""Compiled codebook schema cache.
+
+Parsing the ~70 codebook CSVs and importing schema_config on every run is
+repeated work: the inputs only change when the codebook or schema_config.py is
+edited. compiled_schema() keeps the parsed result in a versioned JSON file next
+to the codebook, keyed by a hash of every *_columns.csv plus schema_config.py,
+and rebuilds it automatically when that hash changes.
+
+Usage:
+    from schema_cache import compiled_schema
+
+    compiled = compiled_schema("database_info/codebook_tables")
+    compiled["tables"]["real_acct"]   # list of column dicts (ColumnDef fields)
+    compiled["schema"]["real_acct"]   # schema_config.SCHEMA_MAP entry
+
+Pass rebuild=True (or delete the cache file) to force a rebuild.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from dataclasses import asdict
+from pathlib import Path
+from typing import Any, Dict
+
+# Bump when the compiled layout changes so stale caches are rebuilt.
+SCHEMA_CACHE_VERSION = 1
+SCHEMA_CACHE_FILE = ".schema_cache.json"
+SCHEMA_CONFIG_PATH = Path(__file__).with_name("schema_config.py")
+
+
+def _log(msg: str) -> None:
+    print(f"[schema_cache] {msg}")
+
+
+def schema_cache_key(codebook_dir: str | Path) -> str:
+    """Hash the codebook CSVs and schema_config.py into the cache key."""
+    digest = hashlib.sha1(f"v{SCHEMA_CACHE_VERSION}".encode())
+    for csv_file in sorted(Path(codebook_dir).glob("*_columns.csv")):
+        digest.update(csv_file.name.encode())
+        digest.update(csv_file.read_bytes())
+    digest.update(SCHEMA_CONFIG_PATH.read_bytes())
+    return digest.hexdigest()
+
+
+def _compile(codebook_dir: Path, key: str) -> Dict[str, Any]:
+    # Imported lazily: load imports this module, and a cache hit needs neither.
+    import load
+    import schema_config
+
+    table_defs = load.discover_codebook_tables(codebook_dir, use_cache=False)
+    return {
+        "version": SCHEMA_CACHE_VERSION,
+        "key": key,
+        "tables": {
+            name: [asdict(col) for col in cols] for name, cols in table_defs.items()
+        },
+        # JSON turns the FK tuples into lists; consumers only iterate them.
+        "schema": json.loads(json.dumps(schema_config.SCHEMA_MAP)),
+    }
+
+
+def compiled_schema(codebook_dir: str | Path, rebuild: bool = False) -> Dict[str, Any]:
+    """Return the compiled schema for codebook_dir, rebuilding it if stale.
+
+    The cache lives at <codebook_dir>/.schema_cache.json. If it cannot be
+    written (read-only checkout) the freshly compiled schema is still returned.
+    """
+    codebook_dir = Path(codebook_dir)
+    cache_path = codebook_dir / SCHEMA_CACHE_FILE
+    key = schema_cache_key(codebook_dir)
+    if not rebuild and cache_path.exists():
+        try:
+            cached = json.loads(cache_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            cached = None
+        if (
+            isinstance(cached, dict)
+            and cached.get("version") == SCHEMA_CACHE_VERSION
+            and cached.get("key") == key
+        ):
+            return cached
+
+    compiled = _compile(codebook_dir, key)
+    if compiled["tables"]:
+        # Write then rename so concurrent loader processes never read a partial file
+        tmp_path = cache_path.with_name(f"{cache_path.name}.{os.getpid()}.tmp")
+        try:
+            tmp_path.write_text(json.dumps(compiled), encoding="utf-8")
+            os.replace(tmp_path, cache_path)
+        except OSError as e:
+            _log(f"Could not write {cache_path}: {e}")
+            tmp_path.unlink(missing_ok=True)
+    return compiled
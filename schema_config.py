@@ -1,6 +1,10 @@
 """
 Corrected schema configuration with actual column names from source files.
 Primary keys manually verified against data patterns and codebook.
+
+"column_types" overrides the codebook (which declares everything as
+varchar/char) for value and date columns: "numeric", "int" or "date".
+Dates are in the source's MM/DD/YYYY format. Primary key columns always stay text.
 """
 
 SCHEMA_MAP = {
@@ -9,6 +13,16 @@ SCHEMA_MAP = {
         "primary_key": ["acct"],
         "foreign_keys": [],
         "indexes": [["neighborhood_code"], ["school_dist"], ["state_class"]],
+        "column_types": {
+            "tot_mkt_val": "numeric",
+            "tot_appr_val": "numeric",
+            "land_val": "numeric",
+            "land_ar": "numeric",
+            "bld_ar": "numeric",
+            "bld_val": "numeric",
+            "x_features_val": "numeric",
+            "ag_val": "numeric",
+        },
     },
     # ========== BUILDING TABLES ==========
     "building_res": {
@@ -17,6 +31,14 @@ SCHEMA_MAP = {
             (["acct"], "real_acct", ["acct"]),
         ],
         "indexes": [["yr_blt"], ["tot_use_cd"]],
+        "column_types": {
+            "heat_ar": "numeric",
+            "im_sq_ft": "numeric",
+            "gross_ar": "numeric",
+            "eff_ar": "numeric",
+            "cama_replacement_cost": "numeric",
+            "accrued_depr_pct": "numeric",
+        },
     },
     "building_other": {
         "primary_key": ["acct", "bld_num"],
@@ -30,6 +52,7 @@ SCHEMA_MAP = {
         "foreign_keys": [
             (["acct", "bld_num"], "building_res", ["acct", "bld_num"]),
         ],
+        "column_types": {"units": "numeric"},
     },
     "exterior": {
         "primary_key": ["acct", "bld_num", "sar_cd"],
@@ -87,12 +110,14 @@ SCHEMA_MAP = {
             (["acct"], "real_acct", ["acct"]),
         ],
         "indexes": [["appraised_val"], ["taxable_val"]],
+        "column_types": {"appraised_val": "numeric", "taxable_val": "numeric"},
     },
     "jur_exempt": {
         "primary_key": ["acct", "tax_district", "exempt_cat"],
         "foreign_keys": [
             (["acct"], "real_acct", ["acct"]),
         ],
+        "column_types": {"exempt_val": "numeric"},
     },
     "jur_exempt_cd": {
         "primary_key": ["acct", "exempt_cat"],
@@ -120,6 +145,7 @@ SCHEMA_MAP = {
         "foreign_keys": [
             (["acct"], "real_acct", ["acct"]),
         ],
+        "column_types": {"dos": "date"},
     },
     "ownership_history": {
         "primary_key": ["acct", "purchase_date"],
@@ -132,6 +158,7 @@ SCHEMA_MAP = {
         "foreign_keys": [
             (["acct"], "real_acct", ["acct"]),
         ],
+        "column_types": {"issue_date": "date"},
     },
     "parcel_tieback": {
         "primary_key": ["acct", "related_acct"],
@@ -201,6 +228,10 @@ SCHEMA_MAP = {
             (["acct"], "real_acct", ["acct"]),
         ],
         "indexes": [["Tax_Year"]],
+        "column_types": {
+            "Initial_Appraised_Value": "numeric",
+            "Final_Appraised_Value": "numeric",
+        },
     },
     "arb_protest_pp": {
         "primary_key": ["acct", "protested_dt"],
@@ -360,3 +391,8 @@ def get_foreign_keys(table_name):
 def get_indexes(table_name):
     """Return the index definitions for a table."""
     return SCHEMA_MAP.get(table_name, {}).get("indexes", [])
+
+
+def get_column_types(table_name):
+    """Return the {column: "numeric" | "int" | "date"} type overrides for a table."""
+    return SCHEMA_MAP.get(table_name, {}).get("column_types", {})
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Tests for delta.py. They need a PostgreSQL server (see the pg_uri fixture in
+conftest.py) and are skipped without one.
+"""
+
+import pytest
+from sqlalchemy import create_engine
+
+import delta
+import load
+
+
+def _state_class_file(indir, description):
+    indir.mkdir(exist_ok=True)
+    (indir / "desc_r_01_state_class.txt").write_text(
+        f"Code\tDept\tDescription\nA1\tRP\t{description}\n", encoding="utf-8"
+    )
+
+
+def _description(db_uri):
+    engine = create_engine(db_uri, future=True)
+    try:
+        with engine.connect() as conn:
+            return conn.exec_driver_sql(
+                'SELECT "Description" FROM desc_r_01_state_class'
+            ).scalar()
+    finally:
+        engine.dispose()
+
+
+def test_delta_after_full_reload_compares_values(tmp_path, pg_uri, monkeypatch):
+    # Views from post_load_setup.sql would block the next drop-and-reload
+    monkeypatch.setattr(load, "_execute_post_load_setup", lambda engine: None)
+    old, new = tmp_path / "old", tmp_path / "new"
+    _state_class_file(old, "Old")
+    _state_class_file(new, "New")
+    summary = tmp_path / "summary.json"
+
+    load.load_data(str(old), pg_uri, rejects_dir=None)
+    delta.delta_load(str(new), pg_uri, rejects_dir=None, summary_path=summary)
+    assert _description(pg_uri) == "New"
+
+    # A full reload of the old file replaces the rows the digests describe
+    load.load_data(str(old), pg_uri, rejects_dir=None)
+    assert _description(pg_uri) == "Old"
+    result = delta.delta_load(str(new), pg_uri, rejects_dir=None, summary_path=summary)
+    assert result["desc_r_01_state_class"]["updated"] == 1
+    assert _description(pg_uri) == "New"
+
+
+def test_failed_delta_drops_stage_tables(tmp_path, pg_uri, monkeypatch):
+    _state_class_file(tmp_path / "new", "New")
+
+    def fail(*args, **kwargs):
+        raise RuntimeError("boom")
+
+    monkeypatch.setattr(delta, "_upsert_changed", fail)
+    with pytest.raises(RuntimeError, match="boom"):
+        delta.delta_load(
+            str(tmp_path / "new"),
+            pg_uri,
+            rejects_dir=None,
+            summary_path=tmp_path / "summary.json",
+        )
+    engine = create_engine(pg_uri, future=True)
+    with engine.connect() as conn:
+        stages = conn.exec_driver_sql(
+            "SELECT relname FROM pg_class WHERE relname LIKE %(p)s",
+            {"p": delta.STAGE_PREFIX + "%"},
+        ).all()
+    engine.dispose()
+    assert stages == []
@@ -0,0 +1,418 @@
+#!/usr/bin/env python3
+"""
+Tests for segmented downloads in download.py against a local HTTP server
+that serves files from a temporary directory with ETag and Range support.
+"""
+
+import http.server
+import os
+import threading
+
+import pytest
+import requests
+
+import download
+
+
+class _RangeHandler(http.server.BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    root = ""
+    accept_ranges = True
+    requests_seen: list = []
+    fail_ranges = 0
+
+    def log_message(self, *args):
+        pass
+
+    def _file(self):
+        path = os.path.join(self.root, self.path.lstrip("/"))
+        if not os.path.exists(path):
+            self.send_response(404)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return None, None
+        with open(path, "rb") as fh:
+            data = fh.read()
+        return data, f'"{len(data):x}-{os.stat(path).st_mtime_ns:x}"'
+
+    def do_HEAD(self):
+        data, etag = self._file()
+        if data is None:
+            return
+        if self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(data)))
+        self.send_header("ETag", etag)
+        if self.accept_ranges:
+            self.send_header("Accept-Ranges", "bytes")
+        self.end_headers()
+
+    def do_GET(self):
+        data, etag = self._file()
+        if data is None:
+            return
+        rng = self.headers.get("Range")
+        type(self).requests_seen.append(rng)
+        if self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.end_headers()
+            return
+        start, end = 0, len(data) - 1
+        partial = (
+            self.accept_ranges and rng and self.headers.get("If-Range") in (None, etag)
+        )
+        if partial:
+            first, _, last = rng.split("=")[1].partition("-")
+            start, end = int(first), int(last) if last else len(data) - 1
+        body = data[start : end + 1]
+        self.send_response(206 if partial else 200)
+        if partial:
+            self.send_header("Content-Range", f"bytes {start}-{end}/{len(data)}")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("ETag", etag)
+        self.end_headers()
+        if partial and type(self).fail_ranges > 0:
+            # Drop the connection halfway through the range
+            type(self).fail_ranges -= 1
+            self.wfile.write(body[: len(body) // 2])
+            self.wfile.flush()
+            self.connection.shutdown(2)
+            self.close_connection = True
+            return
+        self.wfile.write(body)
+
+
+@pytest.fixture
+def server(tmp_path, monkeypatch):
+    served = tmp_path / "served"
+    served.mkdir()
+    handler = type(
+        "Handler",
+        (_RangeHandler,),
+        {"root": str(served), "requests_seen": [], "fail_ranges": 0},
+    )
+    httpd = http.server.ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    monkeypatch.setattr(download, "MIN_SEGMENT_BYTES", 1024)
+    monkeypatch.setattr(download, "HAS_TQDM", False)
+    yield served, handler, f"http://127.0.0.1:{httpd.server_address[1]}"
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def _payload(size):
+    return bytes(range(256)) * (size // 256) + b"x" * (size % 256)
+
+
+def _partial_download(served, base, out, data, etag=None):
+    """Leave the first 4000 bytes of Real_acct.zip in out as an interrupted
+    single-stream download; returns its URL."""
+    (served / "Real_acct.zip").write_bytes(data)
+    out.mkdir()
+    url = f"{base}/Real_acct.zip"
+    if etag is None:
+        with requests.head(url) as resp:
+            etag = resp.headers["ETag"]
+    part = str(out / "Real_acct.zip.part")
+    with open(part, "wb") as fh:
+        fh.write(data[:4_000])
+    download._write_meta(part, {"url": url, "etag": etag, "size": len(data)})
+    return url
+
+
+def test_single_stream_resumes_part(server, tmp_path):
+    served, handler, base = server
+    data = _payload(10_000)
+    out = tmp_path / "out"
+    url = _partial_download(served, base, out, data)
+
+    headers, meta, offset = download._resume_request(url, str(out / "Real_acct.zip"))
+    assert (headers["Range"], offset, meta) == ("bytes=4000-", 4_000, None)
+    with requests.Session() as session:
+        path = download.download_file(url, str(out), session)
+
+    assert handler.requests_seen == ["bytes=4000-"]
+    assert open(path, "rb").read() == data
+    assert download._read_meta(path)["sha256"] == download.file_sha256(path).hexdigest()
+    assert not os.path.exists(path + ".part")
+    assert not os.path.exists(path + ".part" + download.META_SUFFIX)
+
+
+def test_single_stream_restarts_changed_file(server, tmp_path):
+    served, handler, base = server
+    data = _payload(10_000)
+    out = tmp_path / "out"
+    url = _partial_download(served, base, out, data, etag='"stale"')
+
+    with requests.Session() as session:
+        path = download.download_file(url, str(out), session)
+
+    # If-Range did not match, so the server sent the whole file
+    assert handler.requests_seen == ["bytes=4000-"]
+    assert open(path, "rb").read() == data
+    assert download._read_meta(path)["sha256"] == download.file_sha256(path).hexdigest()
+
+
+def test_single_stream_not_modified(server, tmp_path):
+    served, handler, base = server
+    data = _payload(10_000)
+    (served / "Real_acct.zip").write_bytes(data)
+    out = tmp_path / "out"
+    out.mkdir()
+    url = f"{base}/Real_acct.zip"
+
+    with requests.Session() as session:
+        path = download.download_file(url, str(out), session)
+        meta = download._read_meta(path)
+        headers, _meta, offset = download._resume_request(url, path)
+        assert headers["If-None-Match"] == meta["etag"]
+        assert offset == 0
+        # A leftover .part without a sidecar cannot be resumed and is stale
+        (out / "Real_acct.zip.part").write_bytes(b"stale")
+        assert download.download_file(url, str(out), session) == path
+
+    assert handler.requests_seen == [None, None]
+    assert download._read_meta(path) == meta
+    assert open(path, "rb").read() == data
+    assert not os.path.exists(path + ".part")
+
+
+def test_segmented_download(server, tmp_path):
+    served, handler, base = server
+    data = _payload(10_000)
+    (served / "Real_acct.zip").write_bytes(data)
+    out = tmp_path / "out"
+    out.mkdir()
+
+    with requests.Session() as session:
+        path = download.download_file(
+            f"{base}/Real_acct.zip", str(out), session, segments=4
+        )
+
+    assert open(path, "rb").read() == data
+    assert sorted(handler.requests_seen) == sorted(
+        f"bytes={s}-{e}" for s, e, _ in download._split_segments(len(data), 4)
+    )
+    assert not os.path.exists(path + ".part")
+    meta = download._read_meta(path)
+    assert meta["size"] == len(data)
+    assert meta["sha256"] == download.file_sha256(path).hexdigest()
+
+
+def test_segmented_download_resumes_failed_segments(server, tmp_path):
+    served, handler, base = server
+    data = _payload(10_000)
+    (served / "Real_acct.zip").write_bytes(data)
+    out = tmp_path / "out"
+    out.mkdir()
+    handler.fail_ranges = 1
+
+    with requests.Session() as session:
+        path = download.download_file(
+            f"{base}/Real_acct.zip", str(out), session, chunk_size=256, segments=4
+        )
+
+    assert open(path, "rb").read() == data
+    assert download._read_meta(path)["sha256"] == download.file_sha256(path).hexdigest()
+    # Four ranges, then one request for the rest of the dropped range
+    assert len(handler.requests_seen) == 5
+    resumed = handler.requests_seen[-1]
+    assert resumed not in [
+        f"bytes={s}-{e}" for s, e, _ in download._split_segments(len(data), 4)
+    ]
+
+
+def test_segmented_download_falls_back_without_ranges(server, tmp_path, monkeypatch):
+    served, handler, base = server
+    monkeypatch.setattr(handler, "accept_ranges", False)
+    data = _payload(10_000)
+    (served / "Real_acct.zip").write_bytes(data)
+    out = tmp_path / "out"
+    out.mkdir()
+
+    with requests.Session() as session:
+        path = download.download_file(
+            f"{base}/Real_acct.zip", str(out), session, segments=4
+        )
+
+    assert open(path, "rb").read() == data
+    assert handler.requests_seen == [None]
+
+
+def test_segmented_download_not_modified(server, tmp_path):
+    served, handler, base = server
+    data = _payload(10_000)
+    (served / "Real_acct.zip").write_bytes(data)
+    out = tmp_path / "out"
+    out.mkdir()
+
+    with requests.Session() as session:
+        url = f"{base}/Real_acct.zip"
+        first = download.download_file(url, str(out), session, segments=4)
+        handler.requests_seen.clear()
+        second = download.download_file(url, str(out), session, segments=4)
+
+    assert first == second
+    assert handler.requests_seen == []
+    assert open(second, "rb").read() == data
+
+
+def test_cached_download(server, tmp_path):
+    import download_cache
+
+    served, handler, base = server
+    for year, data in ((2024, _payload(4_000)), (2025, _payload(6_000))):
+        (served / str(year)).mkdir()
+        (served / str(year) / "Real_acct.zip").write_bytes(data)
+    (served / "2025" / "Hearing_files.zip").write_bytes(_payload(4_000))
+    cache = tmp_path / "cache"
+
+    linked = {}
+    for year in (2024, 2025):
+        out = tmp_path / f"out{year}"
+        names = ["Real_acct.zip"] + (["Hearing_files.zip"] if year == 2025 else [])
+        urls = [f"{base}/{year}/{name}" for name in names]
+        paths = download_cache.cached_download(urls, str(out), cache, year=year)
+        assert sorted(os.path.basename(p) for p in paths) == sorted(names)
+        linked[year] = out
+
+    index = download_cache.load_index(cache)
+    # Same file name in two years, and identical bytes under two names
+    assert len(index["objects"]) == 2
+    for sha, entry in index["objects"].items():
+        obj = download_cache.object_path(cache, sha)
+        assert download.file_sha256(str(obj)).hexdigest() == sha
+        out = linked[entry["year"]] / entry["filename"]
+        assert os.path.samefile(obj, out)
+    assert (linked[2024] / "Real_acct.zip").read_bytes() == _payload(4_000)
+    assert (linked[2025] / "Real_acct.zip").read_bytes() == _payload(6_000)
+
+    # Corrupt one object: verification evicts it and the next run refetches it
+    sha = next(s for s, e in index["objects"].items() if e["year"] == 2025)
+    download_cache.object_path(cache, sha).write_bytes(b"corrupt")
+    assert download_cache.verify_cache(cache) == [sha]
+    paths = download_cache.cached_download(
+        [f"{base}/2025/Real_acct.zip"], str(linked[2025]), cache, year=2025
+    )
+    assert open(paths[0], "rb").read() == _payload(6_000)
+    assert sha in download_cache.load_index(cache)["objects"]
+
+
+def test_download_year_verifies_cache(server, tmp_path, monkeypatch):
+    import download_cache
+
+    served, handler, base = server
+    (served / "2025").mkdir()
+    (served / "2025" / "Real_acct.zip").write_bytes(_payload(6_000))
+    monkeypatch.setattr(download, "DEFAULT_ADDITIONAL_URLS", [])
+    cache, out = tmp_path / "cache", tmp_path / "out"
+    kwargs = dict(
+        outdir=str(out),
+        filenames=["Real_acct.zip"],
+        base=base + "/{year}/{fname}",
+        cache_dir=str(cache),
+        engine="async",
+        per_host=1,
+    )
+
+    assert download.download_year(2025, **kwargs) == [str(out / "Real_acct.zip")]
+    (sha,) = download_cache.load_index(cache)["objects"]
+    download_cache.object_path(cache, sha).write_bytes(b"corrupt")
+    (out / "Real_acct.zip").unlink()
+
+    # Without verification the corrupt object would be linked again
+    assert download.download_year(2025, verify_cache=True, **kwargs) == []
+    assert sha not in download_cache.load_index(cache)["objects"]
+    paths = download.download_year(2025, verify_cache=True, **kwargs)
+    assert open(paths[0], "rb").read() == _payload(6_000)
+
+
+def test_check_for_changes(server, tmp_path):
+    served, handler, base = server
+    for name in ("Real_acct.zip", "Hearing_files.zip"):
+        (served / name).write_bytes(_payload(3_000))
+    out = tmp_path / "out"
+    urls = [f"{base}/Real_acct.zip", f"{base}/Hearing_files.zip"]
+
+    assert download.check_for_changes(urls, str(out)) == urls
+    download.download_all(urls, str(out))
+    handler.requests_seen.clear()
+    assert download.check_for_changes(urls, str(out)) == []
+    assert handler.requests_seen == []  # HEAD only
+
+    (served / "Hearing_files.zip").write_bytes(_payload(3_500))
+    missing = f"{base}/Missing.zip"
+    assert download.check_for_changes(urls + [missing], str(out)) == [
+        urls[1],
+        missing,
+    ]
+
+
+def test_async_engine(server, tmp_path):
+    pytest.importorskip("aiohttp")
+    served, handler, base = server
+    payloads = {f"File_{n}.zip": _payload(5_000 + n) for n in range(6)}
+    for name, data in payloads.items():
+        (served / name).write_bytes(data)
+    out = tmp_path / "out"
+    urls = [f"{base}/{name}" for name in payloads] + [f"{base}/Missing.zip"]
+
+    paths = download.download_all(urls, str(out), workers=3, engine="async")
+
+    assert sorted(os.path.basename(p) for p in paths) == sorted(payloads)
+    for name, data in payloads.items():
+        assert (out / name).read_bytes() == data
+        assert download._read_meta(str(out / name))["size"] == len(data)
+
+    # A second run is all 304s and keeps the same files
+    mtimes = {p: os.stat(p).st_mtime_ns for p in paths}
+    handler.requests_seen.clear()
+    again = download.download_all(urls[:-1], str(out), workers=3, engine="async")
+    assert sorted(again) == sorted(paths)
+    assert handler.requests_seen == [None] * len(payloads)
+    assert {p: os.stat(p).st_mtime_ns for p in again} == mtimes
+
+
+def test_check_for_changes_expands_cache_dir(server, tmp_path, monkeypatch):
+    import download_cache
+
+    served, handler, base = server
+    (served / "Real_acct.zip").write_bytes(_payload(3_000))
+    monkeypatch.setenv("HOME", str(tmp_path))
+    urls = [f"{base}/Real_acct.zip"]
+
+    download_cache.cached_download(urls, str(tmp_path / "out"), "~/cache")
+    monkeypatch.chdir(tmp_path)  # a literal ./~ must not be consulted
+
+    assert (
+        download.check_for_changes(urls, str(tmp_path / "out"), cache_dir="~/cache")
+        == []
+    )
+
+
+def test_async_engine_resumes_part(server, tmp_path, monkeypatch):
+    pytest.importorskip("aiohttp")
+    served, handler, base = server
+    monkeypatch.setattr(download, "ASYNC_WRITE_BUFFER", 1024)
+    data = _payload(10_000)
+    (served / "Real_acct.zip").write_bytes(data)
+    out = tmp_path / "out"
+    out.mkdir()
+    url = f"{base}/Real_acct.zip"
+    with requests.head(url) as resp:
+        etag = resp.headers["ETag"]
+    part = str(out / "Real_acct.zip.part")
+    with open(part, "wb") as fh:
+        fh.write(data[:4_000])
+    download._write_meta(part, {"url": url, "etag": etag, "size": len(data)})
+
+    (path,) = download.download_all([url], str(out), engine="async")
+
+    assert handler.requests_seen == ["bytes=4000-"]
+    assert open(path, "rb").read() == data
+    assert download._read_meta(path)["sha256"] == download.file_sha256(path).hexdigest()
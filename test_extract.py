@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""
+Tests for extract.py: Zip-Slip protection in safe_extract and incremental
+re-extraction, member-level extraction on a process pool, and the nested GIS
+archive queue.
+"""
+
+import io
+import multiprocessing
+import zipfile
+from pathlib import Path
+
+import pytest
+
+import extract
+
+
+def _zip(path, members):
+    with zipfile.ZipFile(path, "w") as zf:
+        for name, data in members.items():
+            zf.writestr(zipfile.ZipInfo(name), data)
+    return path
+
+
+def test_safe_extract_skips_traversal(tmp_path):
+    dest = tmp_path / "out" / "dest"
+    archive = _zip(
+        tmp_path / "evil.zip",
+        {
+            "../evil.txt": "x",
+            "a/../../evil2.txt": "x",
+            "../dest2/evil3.txt": "x",  # sibling sharing the dest prefix
+            "/tmp/evil4.txt": "x",
+            "a/../../../../evil5.txt": "x",
+            ".": "x",
+            "ok.txt": "ok",
+            "a/./b/../c.txt": "c",
+            "sub/": "",
+        },
+    )
+
+    with zipfile.ZipFile(archive) as zf:
+        written = extract.safe_extract(zf, dest)
+
+    assert sorted(r["name"] for r in written) == ["a/./b/../c.txt", "ok.txt"]
+    assert (dest / "ok.txt").read_text() == "ok"
+    assert (dest / "a" / "c.txt").read_text() == "c"
+    assert (dest / "sub").is_dir()
+    outside = [
+        p
+        for p in tmp_path.rglob("*")
+        if p.is_file() and dest not in p.parents and p != archive
+    ]
+    assert outside == []
+
+
+def test_member_target():
+    root = "/data/out"
+    assert extract._member_target(root, "a/b.txt") == "/data/out/a/b.txt"
+    assert extract._member_target(root, "a/../b.txt") == "/data/out/b.txt"
+    for member in ("../b.txt", "a/../../b.txt", "/etc/passwd", "../out2/x", "", "."):
+        assert extract._member_target(root, member) is None
+
+
+def test_incremental_extract(tmp_path):
+    indir = tmp_path / "in"
+    indir.mkdir()
+    archive = indir / "Arch.zip"
+    _zip(archive, {"a.txt": "aaa", "sub/b.txt": "bbb", "c.txt": "ccc"})
+
+    def run():
+        (info,) = extract.extract_all(str(indir), str(tmp_path / "x"), incremental=True)
+        return info
+
+    first = run()
+    assert (first["changed_members"], first["extracted_files"]) == (3, 3)
+    assert first["total_bytes"] == 9
+    assert run()["changed_members"] == 0
+
+    _zip(archive, {"a.txt": "aaa", "sub/b.txt": "BBBB", "d.txt": "ddd"})
+    third = run()
+    assert (third["changed_members"], third["removed_members"]) == (2, 1)
+    dest = tmp_path / "x" / "pdata" / "Arch"
+    assert (dest / "sub" / "b.txt").read_text() == "BBBB"
+    assert not (dest / "c.txt").exists()
+    assert [m["name"] for m in third["members"]] == ["a.txt", "d.txt", "sub/b.txt"]
+    assert third["members"][0]["seconds"] is None  # unchanged, not re-extracted
+
+
+def test_incremental_extract_ignores_unsafe_members(tmp_path):
+    indir = tmp_path / "in"
+    indir.mkdir()
+    _zip(indir / "Arch.zip", {"a.txt": "aaa", "../evil.txt": "x"})
+
+    def run():
+        (info,) = extract.extract_all(str(indir), str(tmp_path / "x"), incremental=True)
+        return info
+
+    assert run()["changed_members"] == 1
+    assert run()["changed_members"] == 0
+    assert not (tmp_path / "x" / "pdata" / "evil.txt").exists()
+
+
+@pytest.mark.skipif(
+    "spawn" not in multiprocessing.get_all_start_methods(),
+    reason="member extraction runs on spawned processes",
+)
+def test_extract_members_on_process_pool(tmp_path):
+    indir = tmp_path / "in"
+    indir.mkdir()
+    members = {f"part{i}/t{i}.txt": f"{i}" * (100 + i) for i in range(6)}
+    _zip(indir / "Real_acct.zip", members)
+    _zip(indir / "Hearing_files.zip", {"arb.txt": "arb", "../evil.txt": "x"})
+
+    serial = extract.extract_all(str(indir), str(tmp_path / "serial"))
+    pooled = extract.extract_all(
+        str(indir), str(tmp_path / "pooled"), workers=2, processes=2
+    )
+
+    def summary(results):
+        return sorted(
+            (
+                Path(r["zip"]).name,
+                r["extracted_files"],
+                r["total_bytes"],
+                sorted((m["name"], m["size"], m["crc"]) for m in r["members"]),
+            )
+            for r in results
+        )
+
+    assert not any(r.get("error") for r in pooled)
+    assert summary(pooled) == summary(serial)
+    dest = tmp_path / "pooled" / "pdata"
+    for name, data in members.items():
+        assert (dest / "Real_acct" / name).read_text() == data
+    assert (dest / "Hearing_files" / "arb.txt").read_text() == "arb"
+    assert not (tmp_path / "pooled" / "pdata" / "evil.txt").exists()
+
+    # Incremental runs on the pool only re-extract what changed
+    _zip(indir / "Real_acct.zip", {**members, "part0/t0.txt": "changed"})
+    again = extract.extract_all(
+        str(indir), str(tmp_path / "pooled"), processes=2, incremental=True
+    )
+    changed = {Path(r["zip"]).name: r["changed_members"] for r in again}
+    assert changed == {"Real_acct.zip": 1, "Hearing_files.zip": 0}
+    assert (dest / "Real_acct" / "part0" / "t0.txt").read_text() == "changed"
+
+
+def test_extract_all_queues_nested_gis_zips(tmp_path):
+    def _zip_bytes(members):
+        buf = io.BytesIO()
+        with zipfile.ZipFile(buf, "w") as zf:
+            for name, data in members.items():
+                zf.writestr(name, data)
+        return buf.getvalue()
+
+    indir = tmp_path / "in"
+    indir.mkdir()
+    _zip(
+        indir / "GIS_Public.zip",
+        {
+            "Parcels.zip": _zip_bytes({"Parcels.shp": "shp"}),
+            "sub/Roads.zip": _zip_bytes({"Roads.dbf": "dbf"}),
+            "readme.txt": "gis",
+        },
+    )
+    _zip(indir / "Real_acct.zip", {"real_acct.txt": "acct"})
+    out = tmp_path / "x"
+
+    results = extract.extract_all(str(indir), str(out), workers=3)
+
+    assert sorted(Path(r["zip"]).name for r in results) == [
+        "GIS_Public.zip",
+        "Parcels.zip",
+        "Real_acct.zip",
+        "Roads.zip",
+    ]
+    assert not any(r.get("error") for r in results)
+    gis = out / "gis_data"
+    assert (gis / "Parcels" / "Parcels.shp").read_text() == "shp"
+    assert (gis / "Roads" / "Roads.dbf").read_text() == "dbf"
+    assert (out / "pdata" / "Real_acct" / "real_acct.txt").read_text() == "acct"
+
+    # Nested zips are still found when the bundle itself is skipped
+    again = extract.extract_all(str(indir), str(out), workers=3)
+    assert len(again) == 4
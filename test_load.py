@@ -0,0 +1,495 @@
+#!/usr/bin/env python3
+"""
+Tests for load.py against a throwaway SQLite database (the insert engine), and
+for the PostgreSQL-only parts against the pg_uri database (see conftest.py).
+"""
+
+import threading
+import zipfile
+from concurrent import futures
+from dataclasses import replace
+from datetime import date
+from pathlib import Path
+
+import pytest
+from sqlalchemy import MetaData, create_engine, select
+from sqlalchemy.exc import OperationalError
+
+import load
+
+
+def _table(name):
+    defs = load.discover_codebook_tables(Path(load.CODEBOOK_DIR_DEFAULT))
+    return load.build_table(MetaData(), name, defs[name], constraints=False)
+
+
+def _deeds_file(tmp_path):
+    data = tmp_path / "deeds.txt"
+    data.write_text(
+        "acct\tdos\tclerk_yr\tclerk_id\tdeed_id\n"
+        "0010000000001\t01/15/2024\t2024\tRP-1\t1\n"
+        "0010000000002\t13/40/2024\t2024\tRP-2\t1\n"
+        "0010000000003\t\t2024\tRP-3\t1\n",
+        encoding="utf-8",
+    )
+    return data
+
+
+def test_insert_engine_loads_date_columns(tmp_path):
+    deeds = _table("deeds")
+    data = _deeds_file(tmp_path)
+    engine = create_engine(f"sqlite:///{tmp_path / 'hcad.db'}", future=True)
+    deeds.metadata.create_all(engine)
+
+    assert load.load_table(engine, deeds, data, rejects_dir=tmp_path / "rejects") == 3
+
+    with engine.connect() as conn:
+        rows = conn.execute(select(deeds.c.acct, deeds.c.dos).order_by(deeds.c.acct))
+        assert rows.all() == [
+            ("0010000000001", date(2024, 1, 15)),
+            ("0010000000002", None),
+            ("0010000000003", None),
+        ]
+    rejects = (tmp_path / "rejects" / "deeds.rejects.tsv").read_text(encoding="utf-8")
+    assert rejects.splitlines()[1:] == ["0010000000002\t1\tdos\t13/40/2024"]
+
+
+def test_copy_line_formats_dates():
+    row = ("0010000000001", date(2024, 1, 15), None, "a\tb")
+    assert load._copy_line(row) == "0010000000001\t2024-01-15\t\\N\ta\\tb\n"
+
+
+def test_rejects_written_when_load_fails(tmp_path):
+    deeds = _table("deeds")
+    engine = create_engine(f"sqlite:///{tmp_path / 'hcad.db'}", future=True)
+
+    with pytest.raises(OperationalError):  # table was never created
+        load.load_table(
+            engine, deeds, _deeds_file(tmp_path), rejects_dir=tmp_path / "rejects"
+        )
+
+    rejects = (tmp_path / "rejects" / "deeds.rejects.tsv").read_text(encoding="utf-8")
+    assert rejects.splitlines()[1:] == ["0010000000002\t1\tdos\t13/40/2024"]
+
+
+def _load_rows(tmp_path, db_name, source, byte_range=None):
+    deeds = _table("deeds")
+    engine = create_engine(f"sqlite:///{tmp_path / db_name}", future=True)
+    deeds.metadata.create_all(engine)
+    load.load_table(engine, deeds, source, byte_range=byte_range)
+    with engine.connect() as conn:
+        rows = conn.execute(select(deeds).order_by(deeds.c.acct)).all()
+    engine.dispose()
+    return rows
+
+
+def test_load_from_zip_member_matches_extracted_file(tmp_path):
+    data = _deeds_file(tmp_path)
+    zips = tmp_path / "downloads"
+    zips.mkdir()
+    with zipfile.ZipFile(zips / "Real_acct_owner.zip", "w", zipfile.ZIP_DEFLATED) as zf:
+        zf.write(data, "deeds.txt")
+
+    members = load.find_zip_members(zips)
+    assert list(members) == ["deeds"]
+    member = members["deeds"]
+    assert member.size == data.stat().st_size
+    extracted = _load_rows(tmp_path, "file.db", data)
+    assert _load_rows(tmp_path, "zip.db", member) == extracted
+
+    # A resumed range seeks inside the decompressed member
+    header, first, _rest = data.read_bytes().split(b"\n", 2)
+    resume_from = len(header) + len(first) + 2
+    rng = load.LoadRange("deeds", resume_from=resume_from)
+    assert rng.byte_range(member) == (resume_from, member.size)
+    rows = _load_rows(tmp_path, "resumed.db", member, rng.byte_range(member))
+    assert [row.acct for row in rows] == ["0010000000002", "0010000000003"]
+    assert rows == extracted[1:]
+
+
+def test_resumed_range_appends_rejects(tmp_path):
+    rng = load.LoadRange("deeds", 0, 100, "fp")
+    with rng.reject_log(tmp_path) as rejects:
+        rejects.add(["0010000000001", "1"], "dos", "13/40/2024")
+    with replace(rng, resume_from=50).reject_log(tmp_path) as rejects:
+        rejects.add(["0010000000002", "1"], "dos", "00/00/0000")
+
+    lines = (tmp_path / "deeds.0.rejects.tsv").read_text(encoding="utf-8").splitlines()
+    assert lines == [
+        "acct\tdeed_id\tcolumn\tvalue",
+        "0010000000001\t1\tdos\t13/40/2024",
+        "0010000000002\t1\tdos\t00/00/0000",
+    ]
+
+    # Starting the range over replaces its rejects
+    with rng.reject_log(tmp_path) as rejects:
+        rejects.add(["0010000000003", "1"], "dos", "x")
+    lines = (tmp_path / "deeds.0.rejects.tsv").read_text(encoding="utf-8").splitlines()
+    assert lines[1:] == ["0010000000003\t1\tdos\tx"]
+
+
+_FK_TABLES = ["fixtures", "deeds", "building_res", "desc_r_01_state_class", "real_acct"]
+
+
+def test_dependency_levels():
+    assert load._dependency_levels(_FK_TABLES) == [
+        ["desc_r_01_state_class", "real_acct"],
+        ["building_res", "deeds"],
+        ["fixtures"],
+    ]
+    # Parents outside the list do not hold a table back
+    assert load._dependency_levels(["fixtures", "deeds"]) == [["deeds", "fixtures"]]
+
+
+def test_parallel_load_waits_for_parents(monkeypatch):
+    events = []
+    lock = threading.Lock()
+
+    def fake_worker(settings, table_name, file_path, rng=None):
+        with lock:
+            events.append(("start", table_name))
+        try:
+            if table_name == "building_res":
+                raise RuntimeError("boom")
+            return 1
+        finally:
+            with lock:
+                events.append(("end", table_name))
+
+    # Threads keep the recorded events in this process
+    monkeypatch.setattr(futures, "ProcessPoolExecutor", futures.ThreadPoolExecutor)
+    monkeypatch.setattr(load, "_load_table_worker", fake_worker)
+    plan = {name: [load.LoadRange(name)] for name in _FK_TABLES}
+    plan["real_acct"] = [
+        load.LoadRange("real_acct", 0, 10),
+        load.LoadRange("real_acct", 10),
+    ]
+    plan["desc_r_01_state_class"] = []  # already loaded
+    settings = load.LoadSettings("sqlite://", str(load.CODEBOOK_DIR_DEFAULT), "insert")
+    data_files = {name: Path(f"{name}.txt") for name in _FK_TABLES}
+
+    load._load_tables_parallel(settings, data_files, _FK_TABLES, 3, plan)
+
+    starts = [name for kind, name in events if kind == "start"]
+    assert sorted(starts) == sorted(
+        ["real_acct", "real_acct", "building_res", "deeds", "fixtures"]
+    )
+    last_end = {name: i for i, (kind, name) in enumerate(events) if kind == "end"}
+    first_start = {}
+    for i, (kind, name) in enumerate(events):
+        if kind == "start":
+            first_start.setdefault(name, i)
+    for child, parent in (
+        ("building_res", "real_acct"),
+        ("deeds", "real_acct"),
+        ("fixtures", "building_res"),  # its parent failed but still finished
+    ):
+        assert last_end[parent] < first_start[child]
+
+
+def _parser(table_name, header_line, rejects=None):
+    table = _table(table_name)
+    header, cols = load._parse_header(table, header_line)
+    return load.RowParser(table, header, cols, rejects)
+
+
+def test_row_parser_skips_null_pk_rows():
+    parser = _parser("deeds", "acct\tdeed_id\tclerk_id\n")
+    rows = parser.parse(
+        ["0010000000001\t1\tRP-1\n", "\t2\tRP-2\n", "0010000000003\t \tRP-3\n", "\n"]
+    )
+    assert rows == [("0010000000001", "1", "RP-1")]
+
+
+def test_row_parser_strips_nul_and_whitespace():
+    parser = _parser("deeds", "acct\tdeed_id\tclerk_id\n")
+    assert parser.parse(["0010\x00000000001\t1\t RP\x00-1 \r\n"]) == [
+        ("0010000000001", "1", "RP-1")
+    ]
+
+
+def test_row_parser_pads_short_and_trims_long_rows():
+    parser = _parser("deeds", "acct\tdeed_id\tclerk_id\tclerk_yr\n")
+    rows = parser.parse(
+        ["0010000000001\t1\n", "0010000000002\t2\tRP-2\t2024\textra\tvalues\n"]
+    )
+    assert rows == [
+        ("0010000000001", "1", None, None),
+        ("0010000000002", "2", "RP-2", "2024"),
+    ]
+
+
+def test_duplicate_header_columns_are_mapped_once():
+    header, cols = load._parse_header(
+        _table("deeds"), "acct\tclerk_id\tdeed_id\tclerk_id\n"
+    )
+    assert cols == ["acct", "clerk_id", "deed_id"]
+    parser = load.RowParser(_table("deeds"), header, cols)
+    # The last occurrence supplies the value
+    assert parser.parse(["0010000000001\tfirst\t1\tlast\n"]) == [
+        ("0010000000001", "last", "1")
+    ]
+
+
+def _read_ranges(path, ranges):
+    lines = []
+    for byte_range in ranges:
+        with load._open_data_file(path, byte_range) as (_header, chunk):
+            lines.extend(chunk)
+    return lines
+
+
+@pytest.mark.parametrize("newline", ["\n", "\r\n"])
+@pytest.mark.parametrize("chunk_bytes", [1, 7, 16, 45, 1000])
+def test_byte_ranges_read_every_line_once(tmp_path, newline, chunk_bytes):
+    rows = [f"{i:013d}\t{'x' * (i % 5)}{newline}" for i in range(12)]
+    data = tmp_path / "real_acct.txt"
+    data.write_bytes(("acct\tmailto" + newline + "".join(rows)).encode("utf-8"))
+
+    ranges = load._split_byte_ranges(data, chunk_bytes)
+    assert ranges[0][0] == len("acct\tmailto" + newline)
+    assert ranges[-1][1] == data.stat().st_size
+    assert all(a[1] == b[0] for a, b in zip(ranges, ranges[1:]))
+    # Every boundary sits just after a line break
+    raw = data.read_bytes()
+    assert all(raw[start - 1 : start] == b"\n" for start, _end in ranges)
+    assert _read_ranges(data, ranges) == rows
+
+
+def test_more_chunks_than_lines(tmp_path):
+    data = tmp_path / "real_acct.txt"
+    data.write_text("acct\n1\n2\n", encoding="utf-8")
+    ranges = load._split_byte_ranges(data, 1)
+    assert ranges == [(5, 7), (7, 9)]
+    assert _read_ranges(data, ranges) == ["1\n", "2\n"]
+
+
+@pytest.mark.parametrize("content", ["acct\tmailto\n", "acct\tmailto"])
+def test_header_only_file_has_no_ranges(tmp_path, content):
+    data = tmp_path / "real_acct.txt"
+    data.write_text(content, encoding="utf-8")
+    assert load._split_byte_ranges(data, 1) == []
+    assert load._split_load_ranges("real_acct", data, 1) == [
+        load.LoadRange("real_acct")
+    ]
+    with load._open_data_file(data) as (header, lines):
+        assert header == content
+        assert list(lines) == []
+
+
+def test_data_lines_track_resume_offset(tmp_path):
+    data = tmp_path / "real_acct.txt"
+    data.write_bytes(b"acct\r\n1\r\n22\r\n333")
+    with load._open_data_file(data) as (_header, lines):
+        seen = []
+        for line in lines:
+            seen.append((line, lines.offset))
+    assert seen == [("1\r\n", 9), ("22\r\n", 13), ("333", 16)]
+    # Resuming from a recorded offset yields exactly the remaining lines
+    with load._open_data_file(data, (9, 16)) as (_header, lines):
+        assert list(lines) == ["22\r\n", "333"]
+    with data.open("rb") as fh:
+        batches = list(load._line_batches(load._DataLines(fh, 6), 2))
+    assert batches == [(["1\r\n", "22\r\n"], 13), (["333"], 16)]
+
+
+@pytest.mark.parametrize("value", ["1GB';RESET ALL;--", "1 PB", "GB", "-1GB"])
+def test_maintenance_work_mem_is_validated(value):
+    with pytest.raises(ValueError, match="maintenance_work_mem"):
+        load._finalize_deferred_constraints(None, {}, 1, value)
+
+
+def test_maintenance_work_mem_accepts_sizes():
+    for value in ("1GB", "512 MB", "65536", "64kB"):
+        load._check_memory_setting("maintenance_work_mem", value)
+
+
+def _run_sql(db_uri, *statements):
+    engine = create_engine(db_uri, future=True)
+    try:
+        with engine.begin() as conn:
+            for sql in statements:
+                result = conn.exec_driver_sql(sql)
+            return result.all() if result.returns_rows else None
+    finally:
+        engine.dispose()
+
+
+def _staged_generation(db_uri, schema, value):
+    load._prepare_staging_schema(db_uri, schema)
+    _run_sql(
+        db_uri,
+        f"CREATE TABLE {schema}.t (v text)",
+        f"INSERT INTO {schema}.t VALUES ('{value}')",
+        f"CREATE VIEW {schema}.tv AS SELECT v FROM {schema}.t",
+    )
+
+
+def test_swap_replaces_only_loader_objects(pg_uri):
+    _run_sql(
+        pg_uri,
+        "CREATE TABLE t (v text)",
+        "INSERT INTO t VALUES ('old')",
+        "CREATE TABLE mine (v text)",
+        "CREATE FUNCTION my_helper() RETURNS int LANGUAGE sql AS 'SELECT 1'",
+    )
+    _staged_generation(pg_uri, "hcad_staging_a", "new")
+    load.swap_in_staging_schema(pg_uri, "hcad_staging_a")
+    assert _run_sql(pg_uri, "SELECT v FROM public.t") == [("new",)]
+    assert _run_sql(pg_uri, "SELECT v FROM public.tv") == [("new",)]
+    assert _run_sql(pg_uri, f"SELECT v FROM {load.PREVIOUS_SCHEMA}.t") == [("old",)]
+    assert _run_sql(pg_uri, "SELECT count(*), my_helper() FROM public.mine") == [(0, 1)]
+
+    # The next swap drops the older generation, never the user's objects
+    _staged_generation(pg_uri, "hcad_staging_b", "newer")
+    load.swap_in_staging_schema(pg_uri, "hcad_staging_b")
+    assert _run_sql(pg_uri, f"SELECT v FROM {load.PREVIOUS_SCHEMA}.t") == [("new",)]
+    assert _run_sql(pg_uri, "SELECT count(*) FROM public.mine") == [(0,)]
+
+    load.rollback_schema_swap(pg_uri)
+    assert _run_sql(pg_uri, "SELECT v FROM public.t") == [("new",)]
+    assert _run_sql(pg_uri, f"SELECT v FROM {load.PREVIOUS_SCHEMA}.t") == [("newer",)]
+
+
+def test_swap_refuses_to_drop_generation_still_in_use(pg_uri):
+    _run_sql(pg_uri, "CREATE TABLE t (v text)", "INSERT INTO t VALUES ('old')")
+    _staged_generation(pg_uri, "hcad_staging_a", "new")
+    load.swap_in_staging_schema(pg_uri, "hcad_staging_a")
+    _run_sql(
+        pg_uri,
+        f"CREATE VIEW public.old_t AS SELECT v FROM {load.PREVIOUS_SCHEMA}.t",
+    )
+
+    _staged_generation(pg_uri, "hcad_staging_b", "newer")
+    with pytest.raises(RuntimeError, match="old_t"):
+        load.swap_in_staging_schema(pg_uri, "hcad_staging_b")
+    assert _run_sql(pg_uri, "SELECT v FROM public.old_t") == [("old",)]
+    assert _run_sql(pg_uri, "SELECT v FROM public.t") == [("new",)]
+
+
+def test_resume_refuses_to_truncate_tables_referenced_outside_the_load(
+    tmp_path, pg_uri
+):
+    _run_sql(
+        pg_uri,
+        "CREATE TABLE real_acct (acct text PRIMARY KEY)",
+        "INSERT INTO real_acct VALUES ('0010000000001')",
+        "CREATE TABLE mine (acct text REFERENCES real_acct)",
+        "INSERT INTO mine VALUES ('0010000000001')",
+    )
+    data = tmp_path / "real_acct.txt"
+    data.write_text("acct\n0010000000002\n", encoding="utf-8")
+    engine = create_engine(pg_uri, future=True)
+    load._ensure_journal(engine)
+
+    with pytest.raises(RuntimeError, match="mine"):
+        load._plan_load_ranges(
+            engine, {"real_acct": data}, ["real_acct"], None, [], resume=True
+        )
+    assert _run_sql(pg_uri, "SELECT count(*) FROM real_acct") == [(1,)]
+
+    # Empty referencing tables do not block the reload
+    _run_sql(pg_uri, "DELETE FROM mine")
+    plan = load._plan_load_ranges(
+        engine, {"real_acct": data}, ["real_acct"], None, [], resume=True
+    )
+    engine.dispose()
+    fingerprint = load._file_fingerprint(data, [])
+    assert plan == {"real_acct": [load.LoadRange("real_acct", fingerprint=fingerprint)]}
+    assert _run_sql(pg_uri, "SELECT count(*) FROM real_acct") == [(0,)]
+
+
+def test_journal_upsert_accumulates_progress(pg_uri):
+    engine = create_engine(pg_uri, future=True)
+    load._ensure_journal(engine)
+    rng = load.LoadRange("real_acct", 0, 100, "fp")
+    load._journal_pending(engine, [rng])
+    with engine.begin() as conn:
+        for offset, rows in ((40, 5), (70, 3)):
+            conn.exec_driver_sql(
+                load._JOURNAL_UPSERT, load._journal_params(rng, offset, rows)
+            )
+    load._journal_finish(engine, rng, 100)
+    with engine.connect() as conn:
+        journaled = conn.exec_driver_sql(
+            f"SELECT schema_name, table_name, range_start, range_end, state, "
+            f"committed_offset, rows_loaded FROM {load.JOURNAL_TABLE}"
+        ).all()
+    engine.dispose()
+    assert journaled == [("public", "real_acct", 0, 100, "done", 100, 8)]
+
+
+def _journal_tables(tmp_path, pg_uri):
+    defs = load.discover_codebook_tables(Path(load.CODEBOOK_DIR_DEFAULT))
+    metadata = MetaData()
+    names = ["real_acct", "deeds", "desc_r_01_state_class"]
+    for name in names:
+        load.build_table(metadata, name, defs[name])
+    engine = create_engine(pg_uri, future=True)
+    metadata.create_all(engine)
+    load._ensure_journal(engine)
+    data_files = {}
+    for name in names:
+        data_files[name] = tmp_path / f"{name}.txt"
+        rows = "".join(f"{i:013d}\t{i}\n" for i in range(20))
+        data_files[name].write_text("acct\tdeed_id\n" + rows, encoding="utf-8")
+    return engine, data_files, names
+
+
+def test_plan_load_ranges_skips_finished_and_resumes_partial(tmp_path, pg_uri):
+    engine, data_files, names = _journal_tables(tmp_path, pg_uri)
+    plan = load._plan_load_ranges(engine, data_files, names, 100, [], resume=False)
+    for name in names:
+        expected = load._split_load_ranges(
+            name, data_files[name], 100, load._file_fingerprint(data_files[name], [])
+        )
+        assert plan[name] == expected and len(expected) > 2
+
+    first, second, *rest = plan["real_acct"]
+    load._journal_finish(engine, first, first.end)
+    with engine.begin() as conn:
+        conn.exec_driver_sql(
+            load._JOURNAL_UPSERT, load._journal_params(second, second.start + 14, 1)
+        )
+    for rng in plan["deeds"] + plan["desc_r_01_state_class"]:
+        load._journal_finish(engine, rng, rng.end)
+
+    resumed = load._plan_load_ranges(engine, data_files, names, 100, [], resume=True)
+    engine.dispose()
+    assert resumed == {
+        "real_acct": [replace(second, resume_from=second.start + 14), *rest],
+        "deeds": [],
+        "desc_r_01_state_class": [],
+    }
+    assert resumed["real_acct"][0].byte_range(data_files["real_acct"]) == (
+        second.start + 14,
+        second.end,
+    )
+
+
+def test_plan_load_ranges_restarts_changed_tables_and_children(tmp_path, pg_uri):
+    engine, data_files, names = _journal_tables(tmp_path, pg_uri)
+    plan = load._plan_load_ranges(engine, data_files, names, None, [], resume=False)
+    for name in names:
+        load._journal_finish(engine, plan[name][0], None)
+
+    # A changed parent file reloads the parent and its FK child, not the rest
+    with data_files["real_acct"].open("a", encoding="utf-8") as fh:
+        fh.write("0000000000099\t99\n")
+    resumed = load._plan_load_ranges(engine, data_files, names, None, [], resume=True)
+    with engine.connect() as conn:
+        states = conn.exec_driver_sql(
+            f"SELECT table_name, state FROM {load.JOURNAL_TABLE} ORDER BY 1"
+        ).all()
+    engine.dispose()
+    assert [r.table_name for r in resumed["real_acct"]] == ["real_acct"]
+    assert [r.table_name for r in resumed["deeds"]] == ["deeds"]
+    assert resumed["desc_r_01_state_class"] == []
+    assert resumed["real_acct"][0].fingerprint == load._file_fingerprint(
+        data_files["real_acct"], []
+    )
+    assert states == [
+        ("deeds", "pending"),
+        ("desc_r_01_state_class", "done"),
+        ("real_acct", "pending"),
+    ]
@@ -1,10 +1,15 @@
 """
 Verify that schema_config.py column names match actual source file headers.
+
+Primary keys are read from the compiled schema cache (schema_cache.py), which is
+rebuilt automatically when schema_config.py or the codebook changes.
 """
 
 import os
 from pathlib import Path
-import schema_config
+from schema_cache import compiled_schema
+
+CODEBOOK_DIR = "database_info/codebook_tables"
 
 
 def get_file_header(file_path):
@@ -46,12 +51,13 @@ def main():
     indir = "extracted"
 
     # Get all tables from schema_config
-    tables = schema_config.SCHEMA_MAP.keys()
+    schema_map = compiled_schema(CODEBOOK_DIR)["schema"]
+    tables = schema_map.keys()
 
     mismatches = []
 
     for table_name in tables:
-        pk_cols = schema_config.get_primary_key(table_name)
+        pk_cols = schema_map[table_name].get("primary_key", [])
         if not pk_cols:
             continue  # skip tables without PKs
 